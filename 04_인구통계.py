@@ -2,9 +2,14 @@
 Streamlit 앱: 서울시(자치구) 연령별 인구수 인터랙티브 시각화
 - 파일 업로드 허용 (CSV). 업로드하지 않으면 `/mnt/data/population.csv` 자동 로드 시도.
 - 인코딩 자동 탐지(cp949, euc-kr, utf-8-sig 순)
-- 행정구역 선택 시 나이(x축) vs 인구수(y축) 꺾은선(인터랙티브, Plotly)
+- 정제된 데이터는 원본 해시 기준 디스크 스냅샷으로 저장 → 재시작 후에는 CSV 재파싱 없이 로드
+- 데이터셋은 프로세스당 한 벌만 메모리에 올려 모든 세션이 읽기 전용으로 공유
+- 첫 세션이 열리면 인구/지하철 데이터를 백그라운드에서 동시에 미리 로드 (warmup.py)
+- 행정구역 선택 시 나이(x축) vs 인구수(y축) 꺾은선(인터랙티브, Plotly). 한 번 그린 조합은 figure_cache에 보관
+- 설정/그래프 구역은 fragment라서 옵션을 바꿔도 그 부분만 다시 실행
 - 우측 사이드바에 requirements 파일 내용을 표시 및 다운로드 버튼 제공
-- 코드 복사할 수 있게 전체 코드가 화면(=이 파일)로 표시됩니다.
+- 코드 복사할 수 있게 전체 코드가 화면(=이 파일)로 표시됩니다. (체크했을 때만 읽음)
+- pandas/plotly 같은 무거운 import는 필요한 구간에서 늦게 불러와 첫 화면을 빠르게 그립니다.
 
 사용법 (로컬 또는 Streamlit Cloud):
 1) 이 파일을 `streamlit_app.py`로 저장합니다.
@@ -13,57 +18,11 @@ Streamlit 앱: 서울시(자치구) 연령별 인구수 인터랙티브 시각
 
 """
 
-import io
-import re
-import pandas as pd
 import streamlit as st
-import plotly.express as px
+import metrics
 
 st.set_page_config(page_title="서울시 연령별 인구 시각화", layout="wide")
 
-# ------------------------- 유틸 함수 -------------------------
-
-def try_read_csv(file_like):
-    """여러 인코딩으로 CSV 읽기 시도"""
-    encodings = ['utf-8-sig', 'cp949', 'euc-kr', 'utf-8']
-    last_exc = None
-    for enc in encodings:
-        try:
-            return pd.read_csv(file_like, encoding=enc)
-        except Exception as e:
-            last_exc = e
-            file_like.seek(0)
-    raise last_exc
-
-
-def clean_numeric_column(col):
-    """쉼표 제거 후 정수 변환. 비어있거나 '-' 등은 0으로 처리"""
-    if pd.api.types.is_numeric_dtype(col):
-        return col.astype('Int64')
-    return col.astype(str).str.replace(',', '').str.replace('\u200b','').str.replace(' ', '') \
-              .replace({'': '0', '-': '0', 'nan': '0', 'NaN': '0'}) \
-              .fillna('0').astype(int)
-
-
-def extract_age_cols(columns):
-    """열 이름에서 'N세' 또는 '100세 이상' 형태의 나이 열을 찾아 (정수 나이, 컬럼명) 리스트 반환"""
-    age_cols = []
-    for col in columns:
-        # 예: '2025년10월_거주자_0세' 또는 '2025년10월_거주자_100세 이상'
-        m = re.search(r'(\d{1,3})세\s*이상', col)
-        if m:
-            age = int(m.group(1))
-            age_cols.append((age, col))
-            continue
-        m2 = re.search(r'(\d{1,3})세(?!\s*이상)', col)
-        if m2:
-            age = int(m2.group(1))
-            age_cols.append((age, col))
-    # 정렬: 나이 순. 단, 100세 이상을 100으로 취급(맨끝)
-    age_cols_sorted = sorted(age_cols, key=lambda x: (x[0] if x[0] < 100 else 101))
-    return age_cols_sorted
-
-
 # ------------------------- 사이드바: 데이터 입력 -------------------------
 st.sidebar.title("데이터 입력")
 uploaded_file = st.sidebar.file_uploader("CSV 파일 업로드 (인코딩 자동 감지)", type=['csv'])
@@ -76,23 +35,36 @@ sample_note = """
 st.sidebar.info(sample_note)
 
 # ------------------------- 데이터 로드 -------------------------
+# 데이터 스택은 사이드바가 먼저 그려진 뒤에 import
+import pandas as pd
+from population_data import age_distribution, extract_age_cols, preprocess
+from shared_data import POPULATION_PATH, population_from_bytes, population_from_file
+import warmup
+
+# 첫 세션에서 인구/지하철 데이터를 백그라운드로 동시에 미리 로드 (프로세스당 한 번, QUERY_API_PORT가 있으면 조회 API도)
+warmup.start()
+warmup.render_status(st.sidebar)
 
 df = None
+data_digest = None  # 차트 캐시 키에 쓰는 데이터셋 해시
 
 if uploaded_file is not None and not use_sample:
     try:
-        # file-like 객체는 seek가 가능
-        df = try_read_csv(uploaded_file)
-        st.sidebar.success("업로드 파일 로드 성공")
+        dataset = population_from_bytes(uploaded_file.getvalue())
+        df, data_digest = dataset.frame, dataset.digest
+        st.sidebar.success("업로드 파일 로드 성공" + (" (스냅샷)" if dataset.from_snapshot else ""))
     except Exception as e:
         st.sidebar.error(f"파일 로드 실패: {e}")
 
 if df is None:
     # 업로드 없거나 로드 실패 시 로컬 경로 시도
     try:
-        with open('/mnt/data/population.csv', 'rb') as f:
-            df = try_read_csv(io.BytesIO(f.read()))
-        st.sidebar.success("/mnt/data/population.csv 로드 성공")
+        dataset = population_from_file(POPULATION_PATH)  # 미리 로드 중이면 그 결과를 기다림
+        df, data_digest = dataset.frame, dataset.digest
+        st.sidebar.success(f"{POPULATION_PATH} 로드 성공" + (" (스냅샷)" if dataset.from_snapshot else ""))
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
     except Exception:
         df = None
 
@@ -105,102 +77,80 @@ if df is None and use_sample:
         ["종로구", 135791] + [int(400 * (0.99 ** (a/10))) for a in ages] + [32],
         ["중구", 116927] + [int(500 * (0.99 ** (a/10))) for a in ages] + [18],
     ]
-    df = pd.DataFrame(sample_rows, columns=cols)
+    df = preprocess(pd.DataFrame(sample_rows, columns=cols))
+    df.index = df['행정구역명']
+    data_digest = "sample"
     st.sidebar.success("샘플 데이터 생성 완료")
 
 if df is None:
     st.warning("데이터가 없습니다. CSV를 업로드하거나 use_sample 옵션을 켜거나, 앱에 `/mnt/data/population.csv`를 배치하세요.")
     st.stop()
 
-# ------------------------- 데이터 정제 -------------------------
-
-# 컬럼명 공백 제거
-orig_columns = df.columns.tolist()
-clean_columns = [c.strip() for c in orig_columns]
-df.columns = clean_columns
-
-# 행정구역에서 코드 분리 (예: '서울특별시 (1100000000)')
-if '행정구역' in df.columns:
-    df['행정구역_원본'] = df['행정구역'].astype(str)
-    m = df['행정구역_원본'].str.extract(r"^(.+?)\s*\((\d+)\)\s*$")
-    if m.notnull().all(axis=None):
-        df.loc[:, '행정구역명'] = m[0].fillna(df['행정구역_원본'])
-        df.loc[:, '행정구역코드'] = m[1]
-    else:
-        df.loc[:, '행정구역명'] = df['행정구역_원본']
-        df.loc[:, '행정구역코드'] = ''
-else:
-    st.error("'행정구역' 컬럼을 찾을 수 없습니다. CSV 구조를 확인하세요.")
-    st.stop()
+# ------------------------- 데이터 정제 (population_data.preprocess에서 완료) -------------------------
 
-# 연령 관련 컬럼 추출
+# 연령 관련 컬럼 (정제 단계에서 존재가 확인됨)
 age_cols = extract_age_cols(df.columns)
-if not age_cols:
-    st.error("데이터에서 'N세' 형태의 연령별 컬럼을 찾지 못했습니다.")
-    st.stop()
 
-# 연령 컬럼명과 나이 리스트
-age_to_col = {age: col for age, col in age_cols}
-ages_sorted = [age for age, col in age_cols]
+# 표시용 이름 인덱스 (공유 데이터셋은 이미 행정구역명 인덱스. 복사하지 않고 그대로 참조)
+df_display = df
 
-# 연령별 숫자형 변환
-for age, col in age_cols:
-    try:
-        df[col] = clean_numeric_column(df[col])
-    except Exception:
-        # 실패 시 전체 문자열 → 숫자 변환 시도
-        df[col] = df[col].astype(str).str.replace(',', '').fillna('0').replace({'': '0', '-': '0'}).astype(int)
+# ------------------------- 레이아웃: 컨트롤과 그래프 -------------------------
 
-# 총인구수도 정제 시도
-if '2025년10월_거주자_총인구수' in df.columns:
-    try:
-        df['총인구수'] = clean_numeric_column(df['2025년10월_거주자_총인구수'])
-    except Exception:
-        df['총인구수'] = df['2025년10월_거주자_총인구수']
+st.title("서울시 연령별 인구 — 꺾은선 그래프")
 
-# 표시용 이름 인덱스
-df_display = df.copy()
-if '행정구역명' in df_display.columns:
-    df_display.index = df_display['행정구역명']
+from figure_cache import cached_figure
+from ui_compat import fragment
 
-# ------------------------- 레이아웃: 컨트롤과 그래프 -------------------------
 
-st.title("서울시 연령별 인구 — 꺾은선 그래프")
-col1, col2 = st.columns([1, 2])
-
-with col1:
-    st.header("설정")
-    region = st.selectbox("지역구 선택", options=df_display.index.tolist(), index=0)
-    smoothing = st.checkbox("이동평균(3점) 적용", value=False)
-    show_points = st.checkbox("데이터 포인트 표시", value=True)
-    log_scale = st.checkbox("세로축 로그 스케일", value=False)
-
-with col2:
-    st.header("그래프")
-    # 선택된 지역 데이터 준비
-    row = df_display.loc[region]
-    y_values = [int(row[age_to_col[age]]) for age in ages_sorted]
-    x_values = ages_sorted.copy()
-
-    plot_df = pd.DataFrame({'age': x_values, 'population': y_values})
-
-    if smoothing and len(plot_df) >= 3:
-        plot_df['population_smoothed'] = plot_df['population'].rolling(3, center=True, min_periods=1).mean()
-        y_col = 'population_smoothed'
-    else:
-        y_col = 'population'
-
-    fig = px.line(plot_df, x='age', y=y_col, markers=show_points,
-                  title=f"{region} — 연령별 인구수",
-                  labels={'age': '나이 (세)', y_col: '인구수'})
-
-    # 툴팁에 원래 population도 표시
-    fig.update_traces(hovertemplate='나이: %{x}세<br>인구수: %{y:,}')
-    fig.update_layout(hovermode='x unified', xaxis=dict(dtick=5))
-    if log_scale:
-        fig.update_yaxes(type='log')
-
-    st.plotly_chart(fig, use_container_width=True)
+@fragment
+def age_chart(df_display, age_cols, data_digest):
+    """지역/표시 옵션을 바꾸면 이 함수만 다시 실행 (파일 읽기·정제·코드 보기 등은 건너뜀)"""
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.header("설정")
+        region = st.selectbox("지역구 선택", options=df_display.index.tolist(), index=0)
+        smoothing = st.checkbox("이동평균(3점) 적용", value=False)
+        show_points = st.checkbox("데이터 포인트 표시", value=True)
+        log_scale = st.checkbox("세로축 로그 스케일", value=False)
+
+    with col2:
+        st.header("그래프")
+
+        def build_figure():
+            import plotly.express as px  # 그래프를 처음 그릴 때 한 번만 import
+            # 선택된 지역 데이터 준비
+            with metrics.timed("population", "filter") as rec:
+                plot_df = age_distribution(df_display, region, age_cols)
+
+                if smoothing and len(plot_df) >= 3:
+                    plot_df['population_smoothed'] = plot_df['population'].rolling(3, center=True, min_periods=1).mean()
+                    y_col = 'population_smoothed'
+                else:
+                    y_col = 'population'
+                rec["rows"] = len(plot_df)
+
+            fig = px.line(plot_df, x='age', y=y_col, markers=show_points,
+                          title=f"{region} — 연령별 인구수",
+                          labels={'age': '나이 (세)', y_col: '인구수'})
+
+            # 툴팁에 원래 population도 표시
+            fig.update_traces(hovertemplate='나이: %{x}세<br>인구수: %{y:,}')
+            fig.update_layout(hovermode='x unified', xaxis=dict(dtick=5))
+            if log_scale:
+                fig.update_yaxes(type='log')
+            return fig
+
+        # 같은 데이터에서 본 적 있는 (지역, 설정) 조합이면 저장된 figure를 바로 씀
+        fig, payload_bytes = cached_figure("population", "age_line", (region, smoothing, show_points, log_scale),
+                                           data_digest, build_figure)
+
+        with metrics.timed("population", "render") as rec:
+            rec["bytes"] = payload_bytes
+            st.plotly_chart(fig, use_container_width=True)
+
+
+age_chart(df_display, age_cols, data_digest)
 
 # ------------------------- 다운로드: 요구사항 파일 -------------------------
 
@@ -210,16 +160,21 @@ pandas>=1.5
 plotly>=5.0
 """.strip()
 
+@st.cache_data
+def read_app_source(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
 with st.expander("요구사항 파일 (requirements.txt) 및 앱 파일 보기/다운로드"):
     st.subheader("requirements.txt 내용")
     st.code(requirements_txt, language='text')
     st.download_button("requirements.txt 다운로드", requirements_txt, file_name='requirements.txt')
 
     st.subheader("앱 전체 코드 (복사 가능)")
-    # 이 파일의 소스 코드를 표시(사용자가 복사 가능)
-    import inspect
-    this_src = inspect.getsource(inspect.getmodule(inspect.currentframe()))
-    st.text_area("앱 코드 (전체)", this_src, height=400)
+    # 이 파일의 소스 코드를 표시(사용자가 복사 가능). 체크했을 때만 읽고, 읽은 내용은 캐시
+    if st.checkbox("앱 코드 불러오기", value=False):
+        st.text_area("앱 코드 (전체)", read_app_source(__file__), height=400)
 
 # ------------------------- 추가 정보: 간단 통계 -------------------------
 
@@ -229,4 +184,8 @@ with st.expander("데이터 통계 요약"):
     st.write("총인구수 상위 5개 지역")
     st.dataframe(top5)
 
+# ------------------------- 성능 지표 (?debug=1) -------------------------
+
+metrics.render_debug_panel()
+
 # ------------------------- 끝 -------------------------
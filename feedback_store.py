@@ -0,0 +1,179 @@
+"""
+책/영화 추천 좋아요·싫어요 피드백 저장소 (SQLite, WAL 모드)
+- 피드백 이벤트는 `feedback` 테이블에 추가만 합니다. 이력 전체를 다시 계산하는 일은 없습니다.
+- 아이템 인기도(`item_stats`)와 세션 선호 벡터(`session_pref`)는 이벤트 1건마다 O(1)로 증분 갱신됩니다.
+- 추천 점수 = 기본 점수(선택한 유형의 아이템인지 + 선택한 유형과 글자가 얼마나 겹치는지)
+  + 선호 벡터와 아이템 특징의 코사인 유사도 + 인기도
+  (유사도는 -1~1이라 투표가 많이 쌓여도 기본 점수를 뒤집지 못함. 글자 겹침이 있어서
+  싫어요를 눌러도 반대 글자 유형이 아니라 가까운 유형의 아이템이 올라옴)
+- 글자 특징은 종류별로 따로 둡니다. 책에 준 표는 영화 순위를 바꾸지 않음
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+PREF_WEIGHT = 0.25   # 선호 유사도 점수 가중치
+POP_WEIGHT = 0.5     # 인기도 점수 가중치
+OVERLAP_WEIGHT = 0.5  # 선택한 유형과의 글자 겹침 점수 가중치
+MAX_CACHED_SESSIONS = 1024  # 메모리에 들고 있을 최근 세션 수 (나머지는 필요할 때 DB에서 다시 읽음)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    item TEXT NOT NULL,
+    vote INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS item_stats (
+    item TEXT PRIMARY KEY,
+    likes INTEGER NOT NULL DEFAULT 0,
+    dislikes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS session_vote (
+    session TEXT NOT NULL,
+    item TEXT NOT NULL,
+    vote INTEGER NOT NULL,
+    PRIMARY KEY (session, item)
+);
+CREATE TABLE IF NOT EXISTS session_pref (
+    session TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (session, feature)
+);
+"""
+
+
+def item_features(kind, types):
+    """아이템 특징 벡터(길이 1로 정규화): 종류(book/movie) + 이 아이템을 추천한 MBTI 유형들의 종류별 글자 비율"""
+    features = {f"kind:{kind}": 1.0}
+    share = 1.0 / max(1, len(types))
+    for t in types:
+        for letter in t:
+            key = f"{kind}:letter:{letter}"
+            features[key] = features.get(key, 0.0) + share
+    norm = math.sqrt(sum(v * v for v in features.values()))
+    return {key: v / norm for key, v in features.items()}
+
+
+def type_profile(kind, weights):
+    """선택한 유형들({유형: 가중치})의 글자 벡터 (길이 1, item_features와 같은 키)"""
+    profile = {}
+    for t, w in weights.items():
+        for letter in t:
+            key = f"{kind}:letter:{letter}"
+            profile[key] = profile.get(key, 0.0) + w
+    norm = math.sqrt(sum(v * v for v in profile.values())) or 1.0
+    return {key: v / norm for key, v in profile.items()}
+
+
+def letter_overlap(features, profile):
+    """아이템 특징과 type_profile의 내적 (0~1, 글자가 많이 겹칠수록 큼)"""
+    return sum(profile.get(f, 0.0) * v for f, v in features.items())
+
+
+class FeedbackStore:
+    """프로세스당 하나 만들어 여러 세션이 공유 (쓰기는 내부 락으로 직렬화)"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # 인기도 카운트는 아이템 수만큼만 있으므로 시작 시 한 번 읽어 메모리에 유지
+        self._stats = {
+            item: [likes, dislikes]
+            for item, likes, dislikes in self._conn.execute("SELECT item, likes, dislikes FROM item_stats")
+        }
+        self._sessions = OrderedDict()  # session -> ({feature: weight}, {item: vote}), 최근 세션만 (LRU)
+
+    def _session_state(self, session):
+        """세션의 선호 벡터/투표. 캐시에 없으면 DB에서 읽고, 오래된 세션은 캐시에서 뺌 (락 안에서 호출)"""
+        state = self._sessions.get(session)
+        if state is None:
+            state = self._sessions[session] = (
+                dict(self._conn.execute("SELECT feature, weight FROM session_pref WHERE session = ?", (session,))),
+                dict(self._conn.execute("SELECT item, vote FROM session_vote WHERE session = ?", (session,))),
+            )
+            while len(self._sessions) > MAX_CACHED_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session)
+        return state
+
+    def record(self, session, item, features, vote):
+        """피드백 1건 반영. vote는 +1(좋아요) 또는 -1(싫어요). 같은 아이템에 다시 투표하면 이전 표를 대체"""
+        if vote not in (1, -1):
+            raise ValueError(f"vote는 1 또는 -1 이어야 합니다: {vote!r}")
+        with self._lock:
+            prefs, votes = self._session_state(session)
+            previous = votes.get(item, 0)
+            if previous == vote:
+                return
+            delta = vote - previous
+            stats = self._stats.setdefault(item, [0, 0])
+            if previous == 1:
+                stats[0] -= 1
+            elif previous == -1:
+                stats[1] -= 1
+            if vote == 1:
+                stats[0] += 1
+            else:
+                stats[1] += 1
+            votes[item] = vote
+            for feature, value in features.items():
+                prefs[feature] = prefs.get(feature, 0.0) + delta * value
+
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute("INSERT INTO feedback (session, item, vote, ts) VALUES (?, ?, ?, ?)",
+                             (session, item, vote, time.time()))
+                conn.execute(
+                    "INSERT INTO item_stats (item, likes, dislikes) VALUES (?, ?, ?) "
+                    "ON CONFLICT(item) DO UPDATE SET likes = excluded.likes, dislikes = excluded.dislikes",
+                    (item, stats[0], stats[1]))
+                conn.execute(
+                    "INSERT INTO session_vote (session, item, vote) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session, item) DO UPDATE SET vote = excluded.vote",
+                    (session, item, vote))
+                conn.executemany(
+                    "INSERT INTO session_pref (session, feature, weight) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session, feature) DO UPDATE SET weight = excluded.weight",
+                    [(session, f, prefs[f]) for f in features])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def vote_of(self, session, item):
+        """세션이 이 아이템에 준 표 (없으면 0)"""
+        with self._lock:
+            return self._session_state(session)[1].get(item, 0)
+
+    def popularity(self, item):
+        """좋아요 비율을 -1~1 사이로 (표가 적을 때는 0 쪽으로 당겨짐)"""
+        likes, dislikes = self._stats.get(item, (0, 0))
+        return (likes - dislikes) / (likes + dislikes + 2)
+
+    def recommend(self, session, candidates, base_scores, k=2):
+        """candidates: {item: features}. 세션이 싫어요 한 아이템은 빼고 점수 상위 k개 반환"""
+        with self._lock:
+            prefs, votes = self._session_state(session)
+            # 후보들이 쓰는 특징만으로 선호 벡터 크기를 잼 → 점수는 코사인 유사도 (-1~1)
+            keys = set().union(*candidates.values()) if candidates else set()
+            pref_norm = math.sqrt(sum(prefs.get(f, 0.0) ** 2 for f in keys)) or 1.0
+            scored = []
+            for order, (item, features) in enumerate(candidates.items()):
+                if votes.get(item) == -1:
+                    continue
+                pref_score = sum(prefs.get(f, 0.0) * v for f, v in features.items()) / pref_norm
+                score = base_scores.get(item, 0.0) + PREF_WEIGHT * pref_score + POP_WEIGHT * self.popularity(item)
+                scored.append((-score, order, item))
+        scored.sort()
+        return [item for _, _, item in scored[:k]]
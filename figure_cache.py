@@ -0,0 +1,87 @@
+"""
+그려 둔 차트(figure) 캐시 (프로세스 공유, 크기 제한 LRU)
+- 키: (종류, 화면 설정 튜플, 데이터셋 해시). 같은 데이터에서 같은 설정으로 돌아오면
+  pandas 계산과 figure 생성을 모두 건너뛰고 저장해 둔 figure JSON에서 바로 복원합니다.
+- 항목 수(MAX_ENTRIES)와 저장 바이트 합계(MAX_BYTES)를 넘으면 가장 오래 안 쓴 것부터 버림
+- figure는 JSON 문자열로 저장하므로 세션끼리 객체를 공유하지 않고, 전송 크기도 덤으로 알 수 있습니다.
+"""
+
+import threading
+from collections import OrderedDict
+
+import metrics
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class LRUCache:
+    """항목 수/바이트 합계 제한이 있는 LRU (스레드 안전)"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def put(self, key, value, nbytes=0):
+        """저장. 한 항목이 max_bytes보다 크면 저장하지 않음"""
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._items.pop(key)[1]
+            self._items[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while len(self._items) > self.max_entries or (
+                    self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self.nbytes -= self._items.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+_cache = LRUCache()
+
+
+def cached_figure(page, kind, params, digest, build):
+    """build()가 만드는 plotly Figure를 JSON으로 캐시. 반환: (Figure, JSON 길이)
+
+    params는 figure 모양을 바꾸는 설정 전부, digest는 데이터셋 해시 (내장 샘플처럼 해시가 없으면 고정 문자열)
+    """
+    key = ("figure", kind, tuple(params), digest)
+    payload = _cache.get(key)
+    metrics.cache_event(page, "figure", payload is not None)
+    if payload is None:
+        with metrics.timed(page, "figure"):
+            fig = build()
+            payload = fig.to_json()
+        _cache.put(key, payload, len(payload))
+        return fig, len(payload)
+    import plotly.io as pio
+    with metrics.timed(page, "figure_restore"):
+        return pio.from_json(payload), len(payload)
+
+
+def cached_frame(page, kind, params, digest, build):
+    """build()가 만드는 작은 결과 표(DataFrame)를 캐시. 반환된 표는 세션끼리 공유하므로 읽기 전용으로 취급"""
+    key = ("frame", kind, tuple(params), digest)
+    frame = _cache.get(key)
+    metrics.cache_event(page, "frame", frame is not None)
+    if frame is None:
+        frame = build()
+        _cache.put(key, frame, int(frame.memory_usage(deep=True).sum()))
+    return frame
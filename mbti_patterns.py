@@ -0,0 +1,104 @@
+"""
+MBTI 일부만 알 때(예: "INxP", "xSTJ") 또는 축별 퍼센트로 입력할 때 쓰는 패턴 조회표
+- 각 자리는 앞 글자 / 뒤 글자 / 모름(X) 중 하나 → 3^4 = 81개 패턴
+- 시작할 때 81개 패턴 전부에 대해 섞인 추천 결과를 미리 계산해 두고, 요청 때는 dict 조회만 합니다.
+- 축별 퍼센트는 글자로 자르지 않고 16유형 가중치로 바꿔 섞습니다. (16유형 × 유형당 몇 개라 상수 시간)
+  E 61%와 E 99%는 결과가 다르고, 50%인 축은 두 글자를 똑같이 섞음
+"""
+
+import itertools
+
+AXES = (("E", "I"), ("S", "N"), ("T", "F"), ("J", "P"))
+WILDCARD = "X"
+WILDCARD_CHARS = "X?*_-"
+RANK_DECAY = 0.8          # 유형별 추천 목록에서 한 순위 내려갈 때마다 곱하는 가중치
+
+
+def all_patterns():
+    """81개 패턴 문자열 (예: 'ESTJ', 'INXP', 'XXXX')"""
+    return ["".join(p) for p in itertools.product(*[(a, b, WILDCARD) for a, b in AXES])]
+
+
+def matching_types(pattern):
+    """패턴에 맞는 16유형 중 일부 (AXES 순서)"""
+    choices = [(a, b) if ch == WILDCARD else (ch,) for ch, (a, b) in zip(pattern, AXES)]
+    return ["".join(t) for t in itertools.product(*choices)]
+
+
+def parse_pattern(text):
+    """사용자 입력을 패턴으로 정규화. 'inxp', 'I N ? P' → 'INXP'. 잘못된 입력은 ValueError"""
+    chars = [c for c in str(text).upper() if not c.isspace()]
+    if len(chars) != len(AXES):
+        raise ValueError(f"네 글자여야 해요 (모르는 자리는 x): {text!r}")
+    pattern = []
+    for ch, (a, b) in zip(chars, AXES):
+        if ch in WILDCARD_CHARS:
+            pattern.append(WILDCARD)
+        elif ch in (a, b):
+            pattern.append(ch)
+        else:
+            raise ValueError(f"'{ch}' 자리는 {a}/{b}/x 중 하나여야 해요: {text!r}")
+    return "".join(pattern)
+
+
+def type_weights(scores):
+    """축별 앞 글자 퍼센트 4개(E, S, T, J %) → {유형: 가중치} (축마다 독립으로 보고 곱함, 합 1, 0인 유형은 뺌)"""
+    if len(scores) != len(AXES):
+        raise ValueError(f"축 퍼센트는 {len(AXES)}개여야 해요: {scores!r}")
+    shares = [{a: score / 100, b: 1 - score / 100} for score, (a, b) in zip(scores, AXES)]
+    weights = {}
+    for t in matching_types(WILDCARD * len(AXES)):
+        w = 1.0
+        for letter, share in zip(t, shares):
+            w *= share[letter]
+        if w > 0:
+            weights[t] = w
+    return weights
+
+
+def scores_label(scores):
+    """축 퍼센트를 짧은 이름으로 (예: [70, 40, 50, 100] → 'E70 N60 T/F50 J100')"""
+    parts = []
+    for score, (a, b) in zip(scores, AXES):
+        if score == 50:
+            parts.append(f"{a}/{b}50")
+        else:
+            parts.append(f"{a}{score}" if score > 50 else f"{b}{100 - score}")
+    return " ".join(parts)
+
+
+def blend(items_by_type, weights, key=lambda item: item):
+    """유형 가중치로 추천 목록을 섞음. 반환: {"types": 가중치 큰 순, "weights": {...}, "items": [(아이템, 점수), ...]}
+
+    점수 = 유형별 순위 가중치(1, RANK_DECAY, ...)의 가중 합. 같은 key의 아이템은 하나로 합칩니다.
+    """
+    weights = {t: w for t, w in weights.items() if t in items_by_type}
+    total = sum(weights.values()) or 1.0
+    scores, first_seen = {}, {}
+    for t, w in weights.items():
+        for rank, item in enumerate(items_by_type[t]):
+            k = key(item)
+            first_seen.setdefault(k, item)
+            scores[k] = scores.get(k, 0.0) + w / total * RANK_DECAY ** rank
+    ranked = sorted(scores, key=lambda k: -scores[k])
+    return {
+        "types": sorted(weights, key=lambda t: -weights[t]),
+        "weights": {t: w / total for t, w in weights.items()},
+        "items": [(first_seen[k], scores[k]) for k in ranked],
+    }
+
+
+def describe_types(blended, limit=4):
+    """섞은 유형 설명 한 줄 (예: 'INTP 42%, INTJ 28%, ...')"""
+    shown = [f"{t} {blended['weights'][t]:.0%}" for t in blended["types"][:limit]]
+    if len(blended["types"]) > limit:
+        shown.append(f"외 {len(blended['types']) - limit}개")
+    return ", ".join(shown)
+
+
+def build_lookup(items_by_type, key=lambda item: item):
+    """{유형: [아이템, ...]} → {패턴: blend 결과}. 패턴에 맞는 유형들을 같은 비중으로 섞음"""
+    return {
+        pattern: blend(items_by_type, {t: 1.0 for t in matching_types(pattern)}, key)
+        for pattern in all_patterns()
+    }
@@ -0,0 +1,146 @@
+"""
+MBTI 궁합으로 큰 명단(수천 명)을 팀/짝으로 나누기
+- 16×16 유형 궁합 행렬을 미리 만들어 두고, 사람이 아니라 유형 단위로 계산합니다.
+  (N명 사이의 N² 궁합 계산 없음 → 명단 크기에 거의 선형)
+- 팀: 팀들이 돌아가며 남은 유형 중 가장 잘 맞는 유형을 뽑는 드래프트(스네이크 순서) + 축 균형(다양성) 페널티
+- 짝(2명): 궁합 높은 유형 쌍부터 탐욕적으로 매칭, 홀수면 남는 한 명은 가장 잘 맞는 짝에 합류
+"""
+
+import math
+
+import numpy as np
+
+from mbti_patterns import AXES, matching_types
+
+TYPES = matching_types("XXXX")
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+
+# 축별 궁합 규칙: (같은 글자일 때 점수, 다른 글자일 때 점수)
+AXIS_AFFINITY = {
+    "EI": (0.5, 1.0),   # 외향/내향은 섞이면 대화 균형이 좋음
+    "SN": (1.0, 0.3),   # 인식 방식이 같으면 소통이 쉬움
+    "TF": (0.6, 1.0),   # 사고/감정은 서로 보완
+    "JP": (1.0, 0.5),   # 계획 스타일은 같을수록 마찰이 적음
+}
+DIVERSITY_WEIGHT = 0.5
+
+
+def compatibility_matrix():
+    """TYPES 순서의 16×16 궁합 행렬 (0~1)"""
+    size = len(TYPES)
+    matrix = np.zeros((size, size))
+    for i, a in enumerate(TYPES):
+        for j, b in enumerate(TYPES):
+            score = sum(
+                AXIS_AFFINITY[x + y][0 if a[k] == b[k] else 1]
+                for k, (x, y) in enumerate(AXES)
+            )
+            matrix[i, j] = score
+    return matrix / sum(max(pair) for pair in AXIS_AFFINITY.values())
+
+
+COMPAT = compatibility_matrix()
+# 유형별 각 축의 앞 글자(E, S, T, J) 여부 (16×4)
+FIRST_LETTERS = np.array([[t[k] == a for k, (a, _) in enumerate(AXES)] for t in TYPES], dtype=float)
+
+
+def type_codes(mbti_values):
+    """MBTI 문자열 목록 → TYPES 인덱스 배열 (알 수 없는 값은 -1)"""
+    return np.array([TYPE_INDEX.get(str(v).strip().upper(), -1) for v in mbti_values], dtype=int)
+
+
+def _draft_teams(remaining, team_size, diversity_weight):
+    """유형 단위 드래프트. 반환: 팀×16 유형별 인원 행렬"""
+    total = int(remaining.sum())
+    n_teams = max(1, math.ceil(total / team_size))
+    capacity = np.full(n_teams, total // n_teams)
+    capacity[: total % n_teams] += 1
+
+    remaining = remaining.astype(float)
+    counts = np.zeros((n_teams, len(TYPES)))
+    first = np.zeros((n_teams, len(AXES)))
+    for rnd in range(int(capacity.max())):
+        order = np.flatnonzero(capacity > rnd)
+        if rnd % 2:
+            order = order[::-1]
+        for team in order:
+            gain = counts[team] @ COMPAT
+            imbalance = np.abs(2 * (first[team] + FIRST_LETTERS) - (rnd + 1)).sum(axis=1)
+            # 동점이면 많이 남은 유형부터 (드물게 남은 유형이 끝에 몰리지 않게)
+            score = gain - diversity_weight * imbalance + 1e-3 * remaining / total
+            score[remaining == 0] = -np.inf
+            pick = int(np.argmax(score))
+            remaining[pick] -= 1
+            counts[team, pick] += 1
+            first[team] += FIRST_LETTERS[pick]
+    return counts.astype(int)
+
+
+def _greedy_pairs(remaining):
+    """궁합 높은 유형 쌍부터 짝짓기. 반환: 팀×16 유형별 인원 행렬 (남는 1명은 최적의 짝에 합류)"""
+    remaining = remaining.copy()
+    upper_i, upper_j = np.triu_indices(len(TYPES))
+    order = np.argsort(-COMPAT[upper_i, upper_j], kind="stable")
+    rows = []
+    for i, j in zip(upper_i[order], upper_j[order]):
+        n_pairs = remaining[i] // 2 if i == j else min(remaining[i], remaining[j])
+        if n_pairs == 0:
+            continue
+        remaining[i] -= n_pairs
+        remaining[j] -= n_pairs
+        row = np.zeros(len(TYPES), dtype=int)
+        row[i] += 1
+        row[j] += 1
+        rows.extend([row] * int(n_pairs))
+    counts = np.array(rows, dtype=int).reshape(-1, len(TYPES))
+    leftover = np.flatnonzero(remaining)
+    if len(leftover):
+        extra = int(leftover[0])
+        if len(counts):
+            best = int(np.argmax(counts @ COMPAT[extra]))
+            counts[best, extra] += 1
+        else:
+            counts = np.zeros((1, len(TYPES)), dtype=int)
+            counts[0, extra] = 1
+    return counts
+
+
+def team_compatibility(counts):
+    """팀×16 인원 행렬 → 팀별 평균 쌍 궁합 (1명 팀은 0)"""
+    counts = np.atleast_2d(counts).astype(float)
+    sizes = counts.sum(axis=1)
+    pair_sum = np.einsum("ti,ij,tj->t", counts, COMPAT, counts) - counts @ np.diag(COMPAT)
+    n_pairs = sizes * (sizes - 1)
+    return np.divide(pair_sum, n_pairs, out=np.zeros_like(pair_sum), where=n_pairs > 0)
+
+
+def form_teams(mbti_values, team_size, diversity_weight=DIVERSITY_WEIGHT):
+    """명단을 team_size명 안팎의 팀으로 나눔
+
+    반환: (teams, counts, unassigned)
+      teams: 팀별 명단 인덱스 리스트, counts: 팀×16 유형별 인원, unassigned: MBTI를 알 수 없어 빠진 인덱스
+    diversity_weight는 3명 이상 팀에만 적용 (2명 짝은 궁합 순 매칭)
+    """
+    if team_size < 2:
+        raise ValueError(f"팀 인원은 2명 이상이어야 해요: {team_size}")
+    codes = type_codes(mbti_values)
+    unassigned = np.flatnonzero(codes < 0).tolist()
+    remaining = np.bincount(codes[codes >= 0], minlength=len(TYPES))
+    if remaining.sum() == 0:
+        return [], np.zeros((0, len(TYPES)), dtype=int), unassigned
+    if team_size == 2:
+        counts = _greedy_pairs(remaining)
+    else:
+        counts = _draft_teams(remaining, team_size, diversity_weight)
+
+    # 유형 단위 배정을 실제 사람에게 풀기: 유형별 대기열에서 순서대로 꺼냄
+    by_type = [np.flatnonzero(codes == t).tolist() for t in range(len(TYPES))]
+    cursor = [0] * len(TYPES)
+    teams = []
+    for row in counts:
+        members = []
+        for t in np.flatnonzero(row):
+            members.extend(by_type[t][cursor[t]: cursor[t] + row[t]])
+            cursor[t] += row[t]
+        teams.append(members)
+    return teams, counts, unassigned
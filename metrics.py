@@ -0,0 +1,151 @@
+"""
+페이지 단계별 계측 (시간, 처리 행 수, 캐시 적중/실패, 전송 바이트)
+- 프로세스 전체에서 공유하는 가벼운 수집기. Streamlit 없이도 import 가능 (디버그 패널만 Streamlit 사용)
+- 단계별 최근 기록(MAX_SAMPLES개)으로 p50/p90/p99를 계산하고, 누적 합계/횟수는 따로 유지
+- 내보내기: Prometheus 텍스트 형식(prometheus_text), APP_METRICS_JSONL 환경변수를 주면 기록마다 JSON 한 줄씩 파일에 추가
+- 디버그 패널: 주소에 ?debug=1 을 붙이거나 APP_METRICS_DEBUG=1 로 실행하면 사이드바에 표시
+
+사용 예:
+    with metrics.timed("subway", "filter") as rec:
+        top10 = top_stations(...)
+        rec["rows"] = len(df_selected)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SAMPLES = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+JSONL_PATH = os.environ.get("APP_METRICS_JSONL")
+DEBUG_ENV = os.environ.get("APP_METRICS_DEBUG") == "1"
+
+_lock = threading.Lock()
+_samples = {}   # (page, stage) -> deque[seconds]
+_totals = {}    # (page, stage) -> [count, seconds_sum, rows_sum, bytes_sum]
+_counters = {}  # (page, name, label) -> count
+
+
+def detailed():
+    """비용이 드는 측정(예: 차트 JSON 크기)까지 할지. JSONL 기록이나 디버그 모드일 때만"""
+    return bool(JSONL_PATH) or DEBUG_ENV or _debug_requested()
+
+
+def _debug_requested():
+    try:
+        import streamlit as st
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def _write_jsonl(record):
+    try:
+        with _lock, open(JSONL_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def observe(page, stage, seconds, rows=None, nbytes=None):
+    """단계 1회 기록"""
+    key = (page, stage)
+    with _lock:
+        _samples.setdefault(key, deque(maxlen=MAX_SAMPLES)).append(seconds)
+        total = _totals.setdefault(key, [0, 0.0, 0, 0])
+        total[0] += 1
+        total[1] += seconds
+        total[2] += rows or 0
+        total[3] += nbytes or 0
+    if JSONL_PATH:
+        _write_jsonl({"ts": time.time(), "page": page, "stage": stage, "seconds": round(seconds, 6),
+                      "rows": rows, "bytes": nbytes})
+
+
+@contextmanager
+def timed(page, stage):
+    """with 블록 시간을 재서 기록. 블록 안에서 rec["rows"], rec["bytes"]를 채우면 같이 기록"""
+    rec = {"rows": None, "bytes": None}
+    start = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        observe(page, stage, time.perf_counter() - start, rec["rows"], rec["bytes"])
+
+
+def increment(page, name, label="", amount=1):
+    """카운터 증가 (예: 인코딩 재시도)"""
+    key = (page, name, label)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+    if JSONL_PATH:
+        _write_jsonl({"ts": time.time(), "page": page, "counter": name, "label": label, "amount": amount})
+
+
+def cache_event(page, cache, hit):
+    """캐시 적중/실패 기록"""
+    increment(page, f"cache_{cache}", "hit" if hit else "miss")
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summary():
+    """단계별 요약 행 목록 (디버그 패널/JSON용)"""
+    with _lock:
+        items = [(key, sorted(values), list(_totals[key])) for key, values in _samples.items()]
+        counters = dict(_counters)
+    rows = []
+    for (page, stage), values, (count, seconds_sum, rows_sum, bytes_sum) in sorted(items):
+        row = {"page": page, "stage": stage, "count": count, "mean_ms": round(seconds_sum / count * 1000, 2)}
+        for q in QUANTILES:
+            row[f"p{int(q * 100)}_ms"] = round(_quantile(values, q) * 1000, 2)
+        row["rows"] = rows_sum
+        row["bytes"] = bytes_sum
+        rows.append(row)
+    return rows, counters
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{str(v).replace(chr(34), "")}"' for k, v in labels.items())
+
+
+def prometheus_text():
+    """Prometheus 텍스트 노출 형식"""
+    with _lock:
+        items = [(key, sorted(values), list(_totals[key])) for key, values in _samples.items()]
+        counters = dict(_counters)
+    lines = [
+        "# HELP app_stage_seconds 페이지 단계별 실행 시간",
+        "# TYPE app_stage_seconds summary",
+    ]
+    for (page, stage), values, (count, seconds_sum, _, _) in sorted(items):
+        for q in QUANTILES:
+            lines.append(f"app_stage_seconds{{{_labels(page=page, stage=stage, quantile=q)}}} {_quantile(values, q):.6f}")
+        lines.append(f"app_stage_seconds_sum{{{_labels(page=page, stage=stage)}}} {seconds_sum:.6f}")
+        lines.append(f"app_stage_seconds_count{{{_labels(page=page, stage=stage)}}} {count}")
+    lines += ["# HELP app_stage_rows_total 단계별 처리 행 수 누적", "# TYPE app_stage_rows_total counter"]
+    lines += [f"app_stage_rows_total{{{_labels(page=p, stage=s)}}} {t[2]}" for (p, s), _, t in sorted(items)]
+    lines += ["# HELP app_stage_bytes_total 단계별 전송 바이트 누적", "# TYPE app_stage_bytes_total counter"]
+    lines += [f"app_stage_bytes_total{{{_labels(page=p, stage=s)}}} {t[3]}" for (p, s), _, t in sorted(items)]
+    lines += ["# HELP app_events_total 캐시 적중/실패, 재시도 등 이벤트 수", "# TYPE app_events_total counter"]
+    lines += [f"app_events_total{{{_labels(page=p, name=n, label=l)}}} {v}" for (p, n, l), v in sorted(counters.items())]
+    return "\n".join(lines) + "\n"
+
+
+def render_debug_panel():
+    """?debug=1 또는 APP_METRICS_DEBUG=1 일 때 사이드바에 단계별 지표 표시"""
+    if not (DEBUG_ENV or _debug_requested()):
+        return
+    import streamlit as st
+    rows, counters = summary()
+    with st.sidebar.expander("🛠 성능 지표 (debug)", expanded=False):
+        st.dataframe(rows, hide_index=True)
+        if counters:
+            st.dataframe([{"page": p, "name": n, "label": l, "count": v} for (p, n, l), v in sorted(counters.items())],
+                         hide_index=True)
+        st.download_button("Prometheus 형식 다운로드", prometheus_text(), file_name="metrics.prom", mime="text/plain")
@@ -1,7 +1,10 @@
 # app.py
 # Streamlit MBTI -> 진로 추천 앱
-# 요구: streamlit만 설치되어 있으면 작동합니다.
+# 요구: streamlit만 설치되어 있으면 작동합니다. (반 전체 명단 기능은 pandas/numpy 필요, 명단을 올릴 때만 import)
+import io
 import streamlit as st
+import metrics
+from mbti_patterns import AXES, WILDCARD, blend, build_lookup, describe_types, parse_pattern, scores_label, type_weights
 
 st.set_page_config(page_title="MBTI 진로 추천 🌟", page_icon="🧭", layout="centered")
 
@@ -243,10 +246,37 @@ MBTI_CAREERS = {
     ],
 }
 
+BLEND_TOP_K = 3  # 여러 유형을 섞을 때 보여줄 진로 수
+INPUT_MODES = ["정확히 알아요", "일부만 알아요 (예: INxP)", "축별 퍼센트로 입력"]
+
+
+@st.cache_resource
+def get_career_lookup():
+    """81개 글자/모름 패턴 → 섞인 진로 추천 조회표 (프로세스 시작 후 한 번만 계산)"""
+    return build_lookup(MBTI_CAREERS, key=lambda item: item["career"])
+
+
 # UI
+mode = st.radio("MBTI 입력 방식", INPUT_MODES, horizontal=True)
 col1, col2 = st.columns([1,1])
 with col1:
-    mbti = st.selectbox("너의 MBTI를 선택해줘 💫", MBTI_TYPES, index=0)
+    pattern = None
+    blended = None  # 축별 퍼센트 입력일 때의 가중 혼합 결과
+    if mode == INPUT_MODES[0]:
+        pattern = st.selectbox("너의 MBTI를 선택해줘 💫", MBTI_TYPES, index=0)
+    elif mode == INPUT_MODES[1]:
+        raw = st.text_input("아는 글자만 적고 모르는 자리는 x로! 💫", value="INxP")
+        try:
+            pattern = parse_pattern(raw)
+        except ValueError as e:
+            st.error(str(e))
+    else:
+        scores = [
+            st.slider(f"{a} ↔ {b} ({a} 쪽 %)", 0, 100, 50, key=f"axis_{a}{b}")
+            for a, b in AXES
+        ]
+        blended = blend(MBTI_CAREERS, type_weights(scores), key=lambda item: item["career"])
+        st.caption(f"퍼센트만큼 16유형을 섞어서 추천해줘 → **{scores_label(scores)}**")
 with col2:
     st.write("")
     st.write("")
@@ -254,13 +284,183 @@ with col2:
 
 st.markdown("---")
 
-if mbti:
+if pattern and WILDCARD not in pattern:
+    mbti = pattern
     st.subheader(f"{mbti} 유형 추천 결과 {MBTI_CAREERS[mbti][0]['emoji']}{MBTI_CAREERS[mbti][1]['emoji']}")
     for idx, item in enumerate(MBTI_CAREERS[mbti], start=1):
         st.markdown(f"### {idx}. {item['career']} {item['emoji']}")
         st.write(f"**어떤 학과가 좋아?** {item['dept']}")
         st.write(f"**어떤 성격이 잘 맞을까?** {item['personality']}")
         st.write("---")
+elif pattern or blended:
+    title = scores_label(scores) if blended else pattern
+    blended = blended or get_career_lookup()[pattern]
+    top = blended["items"][:BLEND_TOP_K]
+    st.subheader(f"{title} — 유형 {len(blended['types'])}개를 섞은 추천 결과 {''.join(item['emoji'] for item, _ in top)}")
+    st.caption("섞은 유형: " + describe_types(blended))
+    for idx, (item, score) in enumerate(top, start=1):
+        st.markdown(f"### {idx}. {item['career']} {item['emoji']}")
+        st.write(f"**어울림 점수** {score:.0%}")
+        st.write(f"**어떤 학과가 좋아?** {item['dept']}")
+        st.write(f"**어떤 성격이 잘 맞을까?** {item['personality']}")
+        st.write("---")
+
+# ------------------------- 반 전체 일괄 추천 (명단 업로드) -------------------------
+
+ROSTER_NAME_COLS = ["이름", "성명", "name", "Name"]
+ROSTER_MBTI_COLS = ["MBTI", "mbti", "유형"]
+
+
+@st.cache_data
+def build_career_table():
+    """MBTI_CAREERS를 유형당 한 행짜리 표로 펼침 (명단 전체와 한 번에 join)"""
+    rows = []
+    for t in MBTI_TYPES:
+        first, second = MBTI_CAREERS[t]
+        rows.append({
+            "MBTI": t,
+            "진로1": first["career"], "학과1": first["dept"],
+            "진로2": second["career"], "학과2": second["dept"],
+        })
+    return pd.DataFrame(rows)
+
+
+def read_roster(file_like):
+    """명단 CSV 읽기 (utf-8-sig → cp949 → euc-kr 순). (이름 열, MBTI 열)만 남겨 반환"""
+    last_exc = None
+    for enc in ("utf-8-sig", "cp949", "euc-kr"):
+        try:
+            roster = pd.read_csv(file_like, encoding=enc, dtype=str)
+            break
+        except Exception as e:
+            last_exc = e
+            file_like.seek(0)
+    else:
+        raise last_exc
+    roster = roster.rename(columns=lambda c: str(c).strip())
+    name_col = next((c for c in ROSTER_NAME_COLS if c in roster.columns), roster.columns[0])
+    mbti_col = next((c for c in ROSTER_MBTI_COLS if c in roster.columns), None)
+    if mbti_col is None:
+        if len(roster.columns) < 2:
+            raise ValueError("명단에 MBTI 열이 없습니다. (이름, MBTI) 두 열이 필요해요.")
+        mbti_col = roster.columns[1]
+    return pd.DataFrame({
+        "이름": roster[name_col],
+        "MBTI": roster[mbti_col].fillna("").str.strip().str.upper(),
+    })
+
+
+def build_roster_report(roster):
+    """명단과 유형표를 MBTI 기준으로 한 번에 left join (학생별 로직 반복 없음)"""
+    report = roster.merge(build_career_table(), on="MBTI", how="left", validate="many_to_one")
+    # 알 수 없는 값("?", "" 등)은 먼저 NA로 바꿔야 Categorical이 경고 없이 만들어짐
+    report["MBTI"] = pd.Categorical(report["MBTI"].where(report["MBTI"].isin(MBTI_TYPES)), categories=MBTI_TYPES)
+    return report
+
+
+def export_report_csv(report):
+    """보고서 CSV (엑셀용 utf-8-sig)를 처음으로 되감은 BytesIO로. 다운로드 버튼을 누를 때만 호출되도록 함수째 넘김
+
+    Streamlit 다운로드는 응답을 흘려보내지 못하고 파일 전체를 한 번에 받으므로 CSV 한 벌은 메모리에 생깁니다.
+    bytes로 다시 꺼내지 않고 버퍼를 그대로 넘겨 복사본이 하나 더 생기지 않게 함
+    """
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding="utf-8-sig", newline="")
+    report.to_csv(text, index=False)
+    text.flush()
+    text.detach()
+    buffer.seek(0)
+    return buffer
+
+
+st.markdown("---")
+st.header("🏫 반 전체 한 번에 추천받기")
+st.write("선생님/상담 선생님용! (이름, MBTI) 두 열짜리 명단 CSV를 올리면 학생별 진로 보고서와 분포를 한 번에 만들어줘 📋")
+roster_file = st.file_uploader("명단 CSV 업로드", type=["csv"], key="roster_file")
+
+roster = None
+if roster_file is not None:
+    import numpy as np
+    import pandas as pd
+    from mbti_teams import DIVERSITY_WEIGHT, form_teams, team_compatibility
+    from ui_compat import download_button
+    try:
+        roster = read_roster(roster_file)
+    except Exception as e:
+        st.error(f"명단을 읽지 못했어요: {e}")
+
+if roster is not None:
+    with metrics.timed("mbti", "roster_join") as rec:
+        report = build_roster_report(roster)
+        rec["rows"] = len(report)
+    valid = report["MBTI"].notna()
+    st.write(f"학생 수: {len(report):,}명  |  유형 인식: {int(valid.sum()):,}명")
+    if not valid.all():
+        st.warning(f"MBTI를 알아볼 수 없는 행이 {int((~valid).sum()):,}개 있어요. 보고서에는 빈칸으로 들어가요.")
+
+    st.subheader("유형 분포")
+    type_counts = report["MBTI"].value_counts(sort=False).rename("인원")
+    st.bar_chart(type_counts)
+
+    st.subheader("축별 분포")
+    letters = report.loc[valid, "MBTI"].astype(str)
+    axis_counts = pd.DataFrame({
+        "축": ["E/I", "S/N", "T/F", "J/P"],
+        "앞 글자": [int((letters.str[i] == a).sum()) for i, a in enumerate("ESTJ")],
+        "뒤 글자": [int((letters.str[i] == b).sum()) for i, b in enumerate("INFP")],
+    })
+    st.dataframe(axis_counts, hide_index=True)
+
+    st.subheader("추천 진로 분포 (1·2순위 합산)")
+    career_counts = pd.concat([report["진로1"], report["진로2"]]).value_counts().rename("인원")
+    st.dataframe(career_counts)
+
+    st.subheader("학생별 보고서 미리보기 (앞 100명)")
+    st.dataframe(report.head(100), hide_index=True)
+    download_button(
+        "학생별 보고서 CSV 다운로드",
+        lambda: export_report_csv(report),
+        key="roster_report_csv",
+        file_name="mbti_career_report.csv",
+        mime="text/csv",
+    )
+
+    st.subheader("👥 궁합으로 팀 나누기")
+    st.caption("유형 궁합(16×16)과 E/I·S/N·T/F·J/P 균형을 같이 봐서 팀을 짜줘. 2명이면 짝 만들기!")
+    team_col1, team_col2 = st.columns(2)
+    team_size = team_col1.number_input("팀 인원", min_value=2, max_value=12, value=4, step=1)
+    # 2명 짝은 궁합 순 매칭이라 축 균형 페널티를 쓰지 않음 → 슬라이더를 끔
+    diversity = team_col2.slider("다양성(축 균형) 중요도", 0.0, 2.0, DIVERSITY_WEIGHT, 0.1,
+                                 disabled=int(team_size) == 2,
+                                 help="3명 이상 팀에만 적용돼요. 2명 짝은 궁합 순으로만 맺어요.")
+    if st.button("팀 만들기 🎲"):
+        with metrics.timed("mbti", "teams") as rec:
+            teams, team_counts, unassigned = form_teams(roster["MBTI"], int(team_size), diversity)
+            rec["rows"] = len(roster)
+        if unassigned:
+            st.warning(f"MBTI를 알 수 없는 {len(unassigned):,}명은 팀 배정에서 빠졌어요.")
+        team_of = np.zeros(len(roster), dtype=int)
+        for number, members in enumerate(teams, start=1):
+            team_of[members] = number
+        assignment = roster.assign(팀=team_of)
+        assignment = assignment[assignment["팀"] > 0].sort_values(["팀", "MBTI"], kind="stable")
+        summary = pd.DataFrame({
+            "팀": np.arange(1, len(teams) + 1),
+            "인원": team_counts.sum(axis=1),
+            "평균 궁합": team_compatibility(team_counts).round(3),
+        })
+        st.write(f"팀 수: {len(teams):,}개  |  전체 평균 궁합: {summary['평균 궁합'].mean():.3f}")
+        st.dataframe(summary, hide_index=True)
+        st.dataframe(assignment.head(200), hide_index=True)
+        download_button(
+            "팀 배정 CSV 다운로드",
+            lambda: export_report_csv(assignment),
+            key="team_assignment_csv",
+            file_name="mbti_teams.csv",
+            mime="text/csv",
+        )
 
 st.info("참고: 이건 성향 기반 추천이야. 너만의 흥미와 경험도 꼭 고려해~ 필요하면 지원 전형/학과 정보도 정리해줄게! 😉")
 st.write("© MBTI 진로 추천기 — 재밌게 참고만 해줘 😄")
+
+metrics.render_debug_panel()
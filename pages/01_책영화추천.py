@@ -1,6 +1,10 @@
 # app.py
 import streamlit as st
 import random
+import uuid
+import metrics
+from feedback_store import OVERLAP_WEIGHT, FeedbackStore, item_features, letter_overlap, type_profile
+from mbti_patterns import AXES, blend, build_lookup, describe_types, parse_pattern, scores_label, type_weights
 
 st.set_page_config(page_title="MBTI 취향 추천 🎯", page_icon="🧭", layout="centered")
 
@@ -181,27 +185,78 @@ recommendations = {
     }
 }
 
-# UI: 선택 박스
-chosen = st.selectbox("너의 MBTI는 뭐야? 😎", ["선택하세요"] + mbti_list)
+FEEDBACK_DB_PATH = "feedback.db"
+KIND_LABELS = {"books": "book", "movies": "movie"}
 
-# 버튼
+
+@st.cache_resource
+def get_feedback_store():
+    """프로세스 전체가 공유하는 피드백 저장소"""
+    return FeedbackStore(FEEDBACK_DB_PATH)
+
+
+@st.cache_data
+def build_catalog():
+    """recommendations를 종류별 {제목: {"blurb", "types", "features"}} 카탈로그로 펼침 (같은 제목은 하나로)"""
+    catalog = {"books": {}, "movies": {}}
+    for mbti in mbti_list:
+        for kind in catalog:
+            for title, blurb in recommendations[mbti][kind]:
+                entry = catalog[kind].setdefault(title, {"blurb": blurb, "types": []})
+                entry["types"].append(mbti)
+    for kind, items in catalog.items():
+        for entry in items.values():
+            entry["features"] = item_features(KIND_LABELS[kind], entry["types"])
+    return catalog
+
+
+@st.cache_resource
+def get_pattern_lookup():
+    """81개 글자/모름 패턴 → 종류별 섞인 추천 점수 조회표 (프로세스 시작 후 한 번만 계산)"""
+    return {
+        kind: build_lookup({t: recommendations[t][kind] for t in mbti_list}, key=lambda rec: rec[0])
+        for kind in ("books", "movies")
+    }
+
+
+def record_vote(title, features, vote):
+    get_feedback_store().record(st.session_state["feedback_session"], title, features, vote)
+
+
+if "feedback_session" not in st.session_state:
+    st.session_state["feedback_session"] = uuid.uuid4().hex
+
+# UI: 입력 방식 + 선택 박스 (일부 글자나 축별 퍼센트만 알아도 OK)
+mode = st.radio("MBTI 입력 방식", ["정확히 알아요", "일부만 알아요", "축별 퍼센트"], horizontal=True)
+chosen = None
+weighted = None  # 축별 퍼센트 입력일 때 종류별 가중 혼합 결과
+if mode == "정확히 알아요":
+    picked = st.selectbox("너의 MBTI는 뭐야? 😎", ["선택하세요"] + mbti_list)
+    chosen = None if picked == "선택하세요" else picked
+elif mode == "일부만 알아요":
+    raw = st.text_input("아는 글자만 적고 모르는 자리는 x로 적어줘 (예: INxP, xSTJ) 😎")
+    if raw:
+        try:
+            chosen = parse_pattern(raw)
+        except ValueError as e:
+            st.error(str(e))
+else:
+    scores = [st.slider(f"{a} ↔ {b} ({a} 쪽 %)", 0, 100, 50, key=f"axis_{a}{b}") for a, b in AXES]
+    chosen = scores_label(scores)
+    weights = type_weights(scores)
+    weighted = {
+        kind: blend({t: recommendations[t][kind] for t in mbti_list}, weights, key=lambda rec: rec[0])
+        for kind in ("books", "movies")
+    }
+    st.caption(f"퍼센트만큼 16유형을 섞어서 추천해줘 → **{chosen}**")
+
+# 버튼 (피드백 버튼을 눌러 다시 실행돼도 결과가 유지되도록 세션에 기억)
 if st.button("추천 받기! 🎁"):
-    if chosen == "선택하세요":
+    if chosen is None:
         st.warning("MBTI를 골라줘야 해~ 하나만 골라봐! 😊")
+        st.session_state.pop("rec_mbti", None)
     else:
-        # 가져오기
-        rec = recommendations.get(chosen)
-        # 헤더
-        st.markdown(f"### {chosen} — 너를 위한 추천 리스트 💡")
-        st.write("책 두 권 📚 / 영화 두 편 🎥 — 간단한 이유도 같이 줄게요!")
-        # 책
-        st.markdown("**📚 책 추천**")
-        for i, (title, blurb) in enumerate(rec["books"], start=1):
-            st.markdown(f"- **{i}. {title}** — {blurb}")
-        # 영화
-        st.markdown("**🎬 영화 추천**")
-        for i, (title, blurb) in enumerate(rec["movies"], start=1):
-            st.markdown(f"- **{i}. {title}** — {blurb}")
+        st.session_state["rec_mbti"] = chosen
         # 재미 요소: 랜덤 한 줄 코멘트
         fun_comments = [
             "오늘 밤에 하나 골라서 보기 딱 좋은데? 😏",
@@ -209,7 +264,41 @@ if st.button("추천 받기! 🎁"):
             "궁금하면 바로 시도해봐, 취향 저격일지도! 💥",
             "친구에게도 추천해주면 쿨해 보일걸? 😉"
         ]
-        st.info(random.choice(fun_comments))
+        st.session_state["rec_comment"] = random.choice(fun_comments)
+
+if chosen is not None and st.session_state.get("rec_mbti") == chosen:
+    store = get_feedback_store()
+    session = st.session_state["feedback_session"]
+    catalog = build_catalog()
+    blended = weighted or {kind: lookup[chosen] for kind, lookup in get_pattern_lookup().items()}
+    # 헤더
+    st.markdown(f"### {chosen} — 너를 위한 추천 리스트 💡")
+    if len(blended["books"]["types"]) > 1:
+        st.caption("섞은 유형: " + describe_types(blended["books"]))
+    st.write("책 두 권 📚 / 영화 두 편 🎥 — 간단한 이유도 같이 줄게요! 👍/👎 누르면 바로 다음 추천에 반영돼~")
+    for kind, label in (("books", "**📚 책 추천**"), ("movies", "**🎬 영화 추천**")):
+        st.markdown(label)
+        items = catalog[kind]
+        # 기본 점수: 선택한 유형과의 글자 겹침 + 패턴에 맞는 유형들의 원래 추천 순위 가중치
+        profile = type_profile(KIND_LABELS[kind], blended[kind]["weights"])
+        base_scores = {title: OVERLAP_WEIGHT * letter_overlap(entry["features"], profile)
+                       for title, entry in items.items()}
+        for (title, _), score in blended[kind]["items"]:
+            base_scores[title] += score
+        candidates = {title: entry["features"] for title, entry in items.items()}
+        with metrics.timed("recommend", "rank") as rec:
+            picks = store.recommend(session, candidates, base_scores, k=2)
+            rec["rows"] = len(candidates)
+        for i, title in enumerate(picks, start=1):
+            entry = items[title]
+            text_col, up_col, down_col = st.columns([8, 1, 1])
+            text_col.markdown(f"- **{i}. {title}** — {entry['blurb']}")
+            voted = store.vote_of(session, title)
+            up_col.button("👍", key=f"up_{kind}_{title}", disabled=voted == 1,
+                          on_click=record_vote, args=(title, entry["features"], 1))
+            down_col.button("👎", key=f"down_{kind}_{title}",
+                            on_click=record_vote, args=(title, entry["features"], -1))
+    st.info(st.session_state.get("rec_comment", ""))
 
 # 사이드바: 간단 설명 및 사용법
 with st.sidebar:
@@ -221,3 +310,5 @@ with st.sidebar:
 # 푸터
 st.markdown("---")
 st.caption("만든이: MBTI 취향 추천봇 🤖 — 즐거운 독서와 영화 타임 되길! 🎉")
+
+metrics.render_debug_panel()
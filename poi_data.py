@@ -0,0 +1,70 @@
+"""
+Top 10 Seoul attractions (static POI data for the map page; no pandas needed)
+"""
+
+# central map location (Seoul City Hall / central Seoul)
+CENTER = (37.5665, 126.9780)
+
+# Top 10 list (name, lat, lon, short description)
+PLACES = [
+    {
+        "name": "Gyeongbokgung Palace",
+        "lat": 37.579884,
+        "lon": 126.976800,
+        "desc": "Main royal palace of the Joseon dynasty; must-see historic site."
+    },
+    {
+        "name": "Changdeokgung Palace (incl. Secret Garden)",
+        "lat": 37.57944,
+        "lon": 126.99278,
+        "desc": "UNESCO World Heritage palace known for its beautiful Secret Garden."
+    },
+    {
+        "name": "Bukchon Hanok Village",
+        "lat": 37.5833,
+        "lon": 126.9830,
+        "desc": "Traditional hanok neighborhood with photogenic alleys and tea houses."
+    },
+    {
+        "name": "N Seoul Tower (Namsan)",
+        "lat": 37.551425,
+        "lon": 126.988000,
+        "desc": "Iconic observation tower with panoramic views of Seoul."
+    },
+    {
+        "name": "Myeongdong",
+        "lat": 37.5633,
+        "lon": 126.9873,
+        "desc": "Major shopping and street-food district popular with visitors."
+    },
+    {
+        "name": "Hongdae (Hongik University area)",
+        "lat": 37.55667,
+        "lon": 126.92361,
+        "desc": "Youthful district known for street performances, nightlife and cafes."
+    },
+    {
+        "name": "Insadong",
+        "lat": 37.5744,
+        "lon": 126.9850,
+        "desc": "Cultural shopping street for crafts, galleries and traditional tea houses."
+    },
+    {
+        "name": "Gwangjang Market",
+        "lat": 37.5703,
+        "lon": 126.9993,
+        "desc": "One of Korea's oldest and largest traditional markets — great street food."
+    },
+    {
+        "name": "Cheonggyecheon Stream (Cheonggye Plaza area)",
+        "lat": 37.5690,
+        "lon": 126.9779,
+        "desc": "Restored urban stream and pedestrian promenade in central Seoul."
+    },
+    {
+        "name": "Lotte World Tower / Seokchon Lake",
+        "lat": 37.5130,
+        "lon": 127.1025,
+        "desc": "Modern skyscraper complex with observation deck, mall and nearby lake."
+    },
+]
@@ -0,0 +1,123 @@
+"""
+서울시 연령별 인구 CSV 읽기/정제 (Streamlit 없이 import 가능)
+- 인코딩 자동 탐지(utf-8-sig, cp949, euc-kr, utf-8 순)
+- 행정구역 이름/코드 분리, 연령 열과 총인구수 숫자 변환
+- 정제 결과는 원본 해시 기준 디스크 스냅샷(snapshot_cache)으로 재사용
+"""
+
+import io
+import re
+
+import pandas as pd
+
+import metrics
+import snapshot_cache
+
+SCHEMA_VERSION = 1  # preprocess 결과 구조가 바뀌면 올려서 예전 스냅샷을 무효화
+TOTAL_SOURCE_COL = '2025년10월_거주자_총인구수'
+
+
+def try_read_csv(file_like):
+    """여러 인코딩으로 CSV 읽기 시도"""
+    encodings = ['utf-8-sig', 'cp949', 'euc-kr', 'utf-8']
+    last_exc = None
+    for enc in encodings:
+        try:
+            return pd.read_csv(file_like, encoding=enc)
+        except Exception as e:
+            last_exc = e
+            metrics.increment("population", "encoding_retry", enc)
+            file_like.seek(0)
+    raise last_exc
+
+
+def clean_numeric_column(col):
+    """쉼표 제거 후 정수 변환. 비어있거나 '-' 등은 0으로 처리"""
+    if pd.api.types.is_numeric_dtype(col):
+        return col.astype('Int64')
+    return col.astype(str).str.replace(',', '').str.replace('\u200b','').str.replace(' ', '') \
+              .replace({'': '0', '-': '0', 'nan': '0', 'NaN': '0'}) \
+              .fillna('0').astype(int)
+
+
+def extract_age_cols(columns):
+    """열 이름에서 'N세' 또는 '100세 이상' 형태의 나이 열을 찾아 (정수 나이, 컬럼명) 리스트 반환"""
+    age_cols = []
+    for col in columns:
+        # 예: '2025년10월_거주자_0세' 또는 '2025년10월_거주자_100세 이상'
+        m = re.search(r'(\d{1,3})세\s*이상', col)
+        if m:
+            age = int(m.group(1))
+            age_cols.append((age, col))
+            continue
+        m2 = re.search(r'(\d{1,3})세(?!\s*이상)', col)
+        if m2:
+            age = int(m2.group(1))
+            age_cols.append((age, col))
+    # 정렬: 나이 순. 단, 100세 이상을 100으로 취급(맨끝)
+    age_cols_sorted = sorted(age_cols, key=lambda x: (x[0] if x[0] < 100 else 101))
+    return age_cols_sorted
+
+
+def preprocess(df):
+    """원본 DataFrame 정제. 필요한 열이 없으면 ValueError"""
+    # 컬럼명 공백 제거
+    df.columns = [c.strip() for c in df.columns]
+
+    # 행정구역에서 코드 분리 (예: '서울특별시 (1100000000)')
+    if '행정구역' not in df.columns:
+        raise ValueError("'행정구역' 컬럼을 찾을 수 없습니다. CSV 구조를 확인하세요.")
+    df['행정구역_원본'] = df['행정구역'].astype(str)
+    m = df['행정구역_원본'].str.extract(r"^(.+?)\s*\((\d+)\)\s*$")
+    if m.notnull().all(axis=None):
+        df.loc[:, '행정구역명'] = m[0].fillna(df['행정구역_원본'])
+        df.loc[:, '행정구역코드'] = m[1]
+    else:
+        df.loc[:, '행정구역명'] = df['행정구역_원본']
+        df.loc[:, '행정구역코드'] = ''
+
+    # 연령 관련 컬럼 추출
+    age_cols = extract_age_cols(df.columns)
+    if not age_cols:
+        raise ValueError("데이터에서 'N세' 형태의 연령별 컬럼을 찾지 못했습니다.")
+
+    # 연령별 숫자형 변환
+    for age, col in age_cols:
+        try:
+            df[col] = clean_numeric_column(df[col])
+        except Exception:
+            # 실패 시 전체 문자열 → 숫자 변환 시도
+            df[col] = df[col].astype(str).str.replace(',', '').fillna('0').replace({'': '0', '-': '0'}).astype(int)
+
+    # 총인구수도 정제 시도
+    if TOTAL_SOURCE_COL in df.columns:
+        try:
+            df['총인구수'] = clean_numeric_column(df[TOTAL_SOURCE_COL])
+        except Exception:
+            df['총인구수'] = df[TOTAL_SOURCE_COL]
+    return df
+
+
+def age_distribution(df, region, age_cols):
+    """행정구역명 인덱스 df에서 한 지역의 나이별 인구 (age, population)"""
+    row = df.loc[region]
+    return pd.DataFrame({
+        'age': [age for age, _ in age_cols],
+        'population': [int(row[col]) for _, col in age_cols],
+    })
+
+
+def load_population_bytes(data, digest=None):
+    """원본 CSV 바이트 → 정제된 DataFrame. 반환: (DataFrame, 스냅샷 사용 여부)"""
+    return snapshot_cache.load_or_build(
+        "population", digest or snapshot_cache.bytes_digest(data), SCHEMA_VERSION,
+        lambda: preprocess(try_read_csv(io.BytesIO(data))),
+    )
+
+
+def load_population_file(path, digest=None):
+    """로컬 CSV 경로 → 정제된 DataFrame. 반환: (DataFrame, 스냅샷 사용 여부)"""
+    def build():
+        with open(path, 'rb') as f:
+            return preprocess(try_read_csv(io.BytesIO(f.read())))
+    return snapshot_cache.load_or_build("population", digest or snapshot_cache.file_digest(path), SCHEMA_VERSION, build)
@@ -0,0 +1,285 @@
+"""
+로컬 HTTP 조회 API (대시보드와 같은 숫자를 다른 도구에서 바로 받기)
+- Streamlit과 같은 프로세스에서 shared_data의 공유 데이터셋을 그대로 씁니다. (다시 읽거나 복사하지 않음)
+- QUERY_API_PORT 환경변수가 있으면 페이지가 처음 열릴 때 warmup이 백그라운드에서 프로세스당 한 번 시작 (데몬 스레드)
+  (QUERY_API_HOST 기본 127.0.0.1). 단독 실행: python query_api.py --port 8765
+- 요청마다 스레드 하나 (ThreadingHTTPServer). pandas 연산 대부분이 GIL을 풀어 동시 요청이 겹쳐 돌고,
+  같은 요청은 응답 캐시(LRU)에서 바로 나갑니다.
+- 응답: 열 단위 JSON {"columns": [...], "data": {열: [값...]}, "rows": n}
+  Accept: application/vnd.apache.arrow.stream (또는 ?format=arrow) 이면 Arrow IPC 스트림
+- ETag = 데이터셋 해시 + 경로 + 정규화한 쿼리 (date=20251001과 2025-10-01은 같은 ETag·캐시 항목).
+  If-None-Match가 같으면 본문 없이 304
+
+엔드포인트:
+    GET /population/regions
+    GET /population/age?region=종로구
+    GET /subway/keys
+    GET /subway/top?date=2025-10-01&line=2호선&n=10
+    GET /metrics            (Prometheus 텍스트, metrics.py)
+    GET /health
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import metrics
+import shared_data
+from figure_cache import LRUCache
+from population_data import age_distribution, extract_age_cols
+from subway_data import select, top_stations
+
+API_HOST = os.environ.get("QUERY_API_HOST", "127.0.0.1")
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+JSON_MIME = "application/json; charset=utf-8"
+MAX_TOP_N = 100
+
+_responses = LRUCache(max_entries=512, max_bytes=32 * 1024 * 1024)
+_lock = threading.Lock()
+_server = None
+_start_failed = False  # 포트 충돌 등으로 실패하면 재실행마다 다시 시도하지 않음
+
+
+class ApiError(Exception):
+    """HTTP 상태 코드와 함께 돌려줄 오류"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---- 데이터셋 / 파라미터 ----
+
+def _dataset(load, path):
+    try:
+        return load(path)
+    except FileNotFoundError:
+        raise ApiError(503, f"데이터 파일이 없습니다: {path}")
+
+
+def population_dataset():
+    return _dataset(shared_data.population_from_file, shared_data.POPULATION_PATH)
+
+
+def subway_dataset():
+    return _dataset(shared_data.subway_from_file, shared_data.SUBWAY_PATH)
+
+
+def _required(params, name):
+    if not params.get(name):
+        raise ApiError(400, f"'{name}' 파라미터가 필요합니다.")
+    return params[name]
+
+
+def _resolve_region(frame, region):
+    """정확한 이름 → 없으면 '... 종로구'처럼 끝이 같은 지역이 하나뿐일 때 그 지역"""
+    if region in frame.index:
+        return region
+    candidates = [name for name in frame.index if name.endswith(" " + region)]
+    if len(candidates) == 1:
+        return candidates[0]
+    if candidates:
+        raise ApiError(400, f"지역이 여러 개 맞습니다: {', '.join(candidates[:10])}")
+    raise ApiError(404, f"지역을 찾을 수 없습니다: {region}")
+
+
+def _parse_date(value):
+    try:
+        if value.isdigit() and len(value) == 8:  # 20251001
+            return datetime.date(int(value[:4]), int(value[4:6]), int(value[6:]))
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"날짜 형식이 잘못됐습니다: {value} (예: 2025-10-01)")
+
+
+def _keep(*names):
+    """쓰는 파라미터만 남기는 정규화 함수 (모르는 파라미터가 ETag/캐시 키를 쪼개지 않게)"""
+    return lambda params: {name: params[name] for name in names if params.get(name)}
+
+
+# ---- 조회 (경로 -> (데이터셋 함수, 파라미터 정규화 함수, 결과 DataFrame을 만드는 함수)) ----
+
+def population_regions(dataset, params):
+    import pandas as pd
+    return pd.DataFrame({"region": dataset.frame.index.tolist()})
+
+
+def population_age(dataset, params):
+    frame = dataset.frame
+    region = _resolve_region(frame, _required(params, "region"))
+    result = age_distribution(frame, region, extract_age_cols(frame.columns))
+    return result.assign(region=region)[["region", "age", "population"]]
+
+
+def subway_keys(dataset, params):
+    import pandas as pd
+    keys = sorted(dataset.index)
+    return pd.DataFrame({"date": [d.isoformat() for d, _ in keys], "line": [line for _, line in keys]})
+
+
+def subway_top_params(params):
+    """날짜는 ISO 문자열로, n은 범위 안의 정수로"""
+    date = _parse_date(_required(params, "date"))
+    line = _required(params, "line")
+    try:
+        n = min(MAX_TOP_N, max(1, int(params.get("n", 10))))
+    except ValueError:
+        raise ApiError(400, "'n'은 정수여야 합니다.")
+    return {"date": date.isoformat(), "line": line, "n": n}
+
+
+def subway_top(dataset, params):
+    date, line = datetime.date.fromisoformat(params["date"]), params["line"]
+    if (date, line) not in dataset.index:
+        raise ApiError(404, f"{date} {line} 데이터가 없습니다.")
+    return top_stations(select(dataset.frame, dataset.index, date, line), params["n"]).reset_index(drop=True)
+
+
+ROUTES = {
+    "/population/regions": (population_dataset, _keep(), population_regions),
+    "/population/age": (population_dataset, _keep("region"), population_age),
+    "/subway/keys": (subway_dataset, _keep(), subway_keys),
+    "/subway/top": (subway_dataset, subway_top_params, subway_top),
+}
+
+
+# ---- 직렬화 ----
+
+def to_json(frame):
+    body = {"columns": list(frame.columns), "data": frame.to_dict(orient="list"), "rows": len(frame)}
+    return json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def to_arrow(frame):
+    import pyarrow as pa
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def etag_for(digest, path, params, fmt):
+    key = json.dumps([digest, path, sorted(params.items()), fmt], ensure_ascii=False)
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def handle_query(path, params, fmt, if_none_match=None):
+    """반환: (상태, 헤더 dict, 본문 bytes). 서버 없이도 호출 가능"""
+    load, normalize, query = ROUTES[path]
+    params = normalize(params)
+    dataset = load()
+    etag = etag_for(dataset.digest, path, params, fmt)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        metrics.increment("api", "not_modified", path)
+        return 304, headers, b""
+
+    key = (path, tuple(sorted(params.items())), fmt, dataset.digest)
+    cached = _responses.get(key)
+    metrics.cache_event("api", "response", cached is not None)
+    if cached is None:
+        with metrics.timed("api", path) as rec:
+            frame = query(dataset, params)
+            body = to_arrow(frame) if fmt == "arrow" else to_json(frame)
+            rec["rows"], rec["bytes"] = len(frame), len(body)
+        cached = (ARROW_MIME if fmt == "arrow" else JSON_MIME, body)
+        _responses.put(key, cached, len(body))
+    headers["Content-Type"] = cached[0]
+    return 200, headers, cached[1]
+
+
+# ---- HTTP 서버 ----
+
+class QueryHandler(BaseHTTPRequestHandler):
+    server_version = "QueryAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        params = dict(parse_qsl(url.query))
+        fmt = params.pop("format", None) or ("arrow" if ARROW_MIME in self.headers.get("Accept", "") else "json")
+        try:
+            if path == "/health":
+                self._send(200, {"Content-Type": JSON_MIME}, b'{"status": "ok"}')
+            elif path == "/metrics":
+                self._send(200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+                           metrics.prometheus_text().encode("utf-8"))
+            elif path not in ROUTES:
+                raise ApiError(404, f"알 수 없는 경로: {path}")
+            elif fmt not in ("json", "arrow"):
+                raise ApiError(400, f"지원하지 않는 형식: {fmt} (json, arrow)")
+            else:
+                self._send(*handle_query(path, params, fmt, self.headers.get("If-None-Match")))
+        except ApiError as e:
+            self._send(e.status, {"Content-Type": JSON_MIME},
+                       json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8"))
+        except Exception as e:
+            self._send(500, {"Content-Type": JSON_MIME},
+                       json.dumps({"error": f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Streamlit 콘솔을 요청 로그로 채우지 않음 (필요하면 /metrics)
+
+
+def start(port, host=API_HOST):
+    """데몬 스레드에서 서버 시작 (프로세스당 한 번, 여러 번 불러도 안전). 반환: 서버"""
+    global _server
+    with _lock:
+        if _server is None:
+            server = ThreadingHTTPServer((host, port), QueryHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="query-api", daemon=True).start()
+            _server = server
+        return _server
+
+
+def start_from_env():
+    """QUERY_API_PORT가 있으면 start. 포트를 이미 다른 프로세스가 쓰고 있으면 알리고 넘어감"""
+    global _start_failed
+    port = os.environ.get("QUERY_API_PORT")
+    if not port or _server is not None or _start_failed:
+        return _server
+    try:
+        return start(int(port))
+    except ValueError:
+        _start_failed = True
+        print(f"query_api: QUERY_API_PORT가 숫자가 아닙니다: {port!r} — 시작하지 않음", file=sys.stderr)
+        return None
+    except OSError as e:
+        _start_failed = True
+        print(f"query_api: {API_HOST}:{port} 에서 시작하지 못했습니다 — {e}", file=sys.stderr)
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import warmup
+
+    parser = argparse.ArgumentParser(description="로컬 HTTP 조회 API (단독 실행)")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=int(os.environ.get("QUERY_API_PORT", 8765)))
+    args = parser.parse_args()
+    # 데이터만 미리 읽음. warmup이 API까지 띄우면 이 모듈을 한 번 더 import 해서 같은 포트에 또 열려고 함
+    warmup.start(api=False)
+    server = start(args.port, args.host)
+    print(f"query_api: http://{args.host}:{args.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
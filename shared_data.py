@@ -0,0 +1,138 @@
+"""
+세션 간 공유 데이터셋 (프로세스당 한 벌, 읽기 전용)
+- st.cache_data는 재실행마다 pickle 복사본을 돌려주므로 동시 세션 수만큼 메모리가 늘어납니다.
+  여기서는 정제된 DataFrame을 프로세스에 한 번만 올려 두고 모든 세션이 같은 객체를 씁니다.
+- pandas Copy-on-Write: 세션이 필터링/열 추가를 해도 공유 원본은 바뀌지 않고, 쓰는 순간에만 필요한 부분이 복사됩니다.
+- Streamlit에 의존하지 않으므로 다른 스레드(미리 로드, API 서버 등)에서도 같은 데이터셋을 씁니다.
+- 같은 데이터셋을 여러 세션이 동시에 요청하면 한 번만 로드하고 나머지는 그 결과를 기다립니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pandas as pd
+
+import metrics
+import population_data
+import snapshot_cache
+import subway_data
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # pandas 3부터는 항상 켜져 있음
+    pd.set_option("mode.copy_on_write", True)
+
+MAX_UPLOADED_DATASETS = 4  # 업로드 파일로 만든 데이터셋은 최근 것 몇 개만 유지
+
+# 페이지와 미리 로드(warmup)가 같이 쓰는 기본 데이터 경로 (부하 테스트 등에서는 환경변수로 바꿈)
+POPULATION_PATH = os.environ.get("APP_POPULATION_PATH", '/mnt/data/population.csv')
+SUBWAY_PATH = os.environ.get("APP_SUBWAY_PATH", "subway.csv")
+
+_lock = threading.Lock()
+_datasets = OrderedDict()  # key -> SharedDataset
+_pending = {}              # key -> Future (로드 중)
+
+
+class SharedDataset:
+    """공유 데이터셋 하나: 정제된 frame + 원본 해시 + 조회용 인덱스 (모두 읽기 전용으로 취급)"""
+
+    def __init__(self, name, frame, digest, from_snapshot, index=None):
+        self.name = name
+        self.frame = frame
+        self.digest = digest
+        self.from_snapshot = from_snapshot
+        self.index = index
+
+
+def _file_key(name, path):
+    """파일 데이터셋 키: 경로 + 수정시각 + 크기 (재실행마다 파일 해시를 다시 계산하지 않음)"""
+    stat = os.stat(path)
+    return ("file", name, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _store(key, dataset):
+    """락 안에서 호출. 같은 파일의 예전 버전과 오래된 업로드 데이터셋은 버림"""
+    if key[0] == "file":
+        for old in [k for k in _datasets if k[:3] == key[:3] and k != key]:
+            del _datasets[old]
+    _datasets[key] = dataset
+    uploads = [k for k in _datasets if k[0] == "bytes"]
+    for old in uploads[:-MAX_UPLOADED_DATASETS]:
+        del _datasets[old]
+
+
+def _get_or_load(key, load):
+    name = key[1]
+    with _lock:
+        if key in _datasets:
+            _datasets.move_to_end(key)
+            dataset = _datasets[key]
+        else:
+            dataset = None
+            future = _pending.get(key)
+            owner = future is None
+            if owner:
+                future = _pending[key] = Future()
+    metrics.cache_event(name, "dataset", dataset is not None)
+    if dataset is not None:
+        return dataset
+    if not owner:
+        with metrics.timed(name, "wait_for_load"):
+            return future.result()
+    try:
+        with metrics.timed(name, "load") as rec:
+            dataset = load()
+            rec["rows"] = len(dataset.frame)
+    except BaseException as e:
+        with _lock:
+            del _pending[key]
+        future.set_exception(e)
+        raise
+    with _lock:
+        del _pending[key]
+        _store(key, dataset)
+    future.set_result(dataset)
+    return dataset
+
+
+def _population_dataset(frame, from_snapshot, digest):
+    # 지역 이름으로 바로 찾을 수 있게 인덱스 지정 (Copy-on-Write라 데이터는 복사되지 않음)
+    frame = frame.set_index("행정구역명", drop=False)
+    frame.index.name = None
+    return SharedDataset("population", frame, digest, from_snapshot)
+
+
+def _subway_dataset(frame, from_snapshot, digest):
+    return SharedDataset("subway", frame, digest, from_snapshot, index=subway_data.build_index(frame))
+
+
+def population_from_file(path):
+    def load():
+        digest = snapshot_cache.file_digest(path)
+        return _population_dataset(*population_data.load_population_file(path, digest), digest)
+    return _get_or_load(_file_key("population", path), load)
+
+
+def population_from_bytes(data):
+    digest = snapshot_cache.bytes_digest(data)
+    return _get_or_load(
+        ("bytes", "population", digest),
+        lambda: _population_dataset(*population_data.load_population_bytes(data, digest), digest),
+    )
+
+
+def subway_from_file(path):
+    def load():
+        digest = snapshot_cache.file_digest(path)
+        return _subway_dataset(*subway_data.load_subway_file(path, digest), digest)
+    return _get_or_load(_file_key("subway", path), load)
+
+
+def subway_from_bytes(data):
+    digest = snapshot_cache.bytes_digest(data)
+    return _get_or_load(
+        ("bytes", "subway", digest),
+        lambda: _subway_dataset(*subway_data.load_subway_bytes(data, digest), digest),
+    )
+
@@ -0,0 +1,79 @@
+"""
+정제된 DataFrame 디스크 스냅샷 캐시 (Arrow Feather, 비압축)
+- 키: 데이터셋 이름 + 스키마 버전 + 원본 파일 해시. 원본이나 정제 로직이 바뀌면 자동으로 새로 만듭니다.
+- 새 Streamlit 워커/서버 재시작 시 CSV 파싱·정제 대신 스냅샷을 memory-map으로 읽습니다.
+- pyarrow가 없거나 스냅샷 읽기/쓰기가 실패하면 그냥 원래 파이프라인을 실행합니다.
+"""
+
+import glob
+import hashlib
+import os
+
+import metrics
+
+SNAPSHOT_DIR = os.environ.get("APP_SNAPSHOT_DIR", ".snapshots")
+HASH_CHUNK_BYTES = 1024 * 1024
+SNAPSHOT_KEEP = 8  # 데이터셋별로 남겨 둘 스냅샷 수 (업로드 파일마다 하나씩 생김)
+
+
+def file_digest(path):
+    """파일 내용 sha1 (1MB씩 읽어서 큰 파일도 메모리에 다 올리지 않음)"""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bytes_digest(data):
+    """업로드 파일처럼 이미 메모리에 있는 원본의 sha1"""
+    return hashlib.sha1(data).hexdigest()
+
+
+def snapshot_path(name, schema_version, digest):
+    return os.path.join(SNAPSHOT_DIR, f"{name}-v{schema_version}-{digest[:16]}.feather")
+
+
+def _read_snapshot(path):
+    from pyarrow import feather
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def _write_snapshot(df, name, schema_version, path):
+    from pyarrow import feather
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    # 스키마 버전이 다른 스냅샷은 지우고, 같은 버전은 최근 것 SNAPSHOT_KEEP개만 남김
+    current_prefix = os.path.join(SNAPSHOT_DIR, f"{name}-v{schema_version}-")
+    snapshots = sorted(glob.glob(os.path.join(SNAPSHOT_DIR, f"{name}-v*.feather")), key=os.path.getmtime, reverse=True)
+    current = [p for p in snapshots if p.startswith(current_prefix)]
+    stale = [p for p in snapshots if not p.startswith(current_prefix)] + current[SNAPSHOT_KEEP:]
+    for old in stale:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def load_or_build(name, digest, schema_version, build):
+    """스냅샷이 있으면 읽고, 없으면 build()로 만든 뒤 저장. 반환: (DataFrame, 스냅샷 사용 여부)"""
+    path = snapshot_path(name, schema_version, digest)
+    if os.path.exists(path):
+        try:
+            with metrics.timed(name, "snapshot_read"):
+                df = _read_snapshot(path)
+            metrics.cache_event(name, "snapshot", True)
+            return df, True
+        except Exception:
+            pass
+    metrics.cache_event(name, "snapshot", False)
+    with metrics.timed(name, "parse_and_clean") as rec:
+        df = build()
+        rec["rows"] = len(df)
+    try:
+        _write_snapshot(df, name, schema_version, path)
+    except Exception:
+        pass
+    return df, False
@@ -0,0 +1,85 @@
+"""
+지하철 승하차 CSV 읽기/정제 (Streamlit 없이 import 가능)
+- 인코딩: cp949 → utf-8 → euc-kr 순으로 시도
+- 사용일자 날짜 변환, 승차/하차 숫자 변환, 승하차합 계산
+- (사용일자, 노선명) 순으로 정렬해 두고 위치 인덱스를 만들어, 날짜·호선 선택은 연속 구간 슬라이스(view)로 처리
+- 정제 결과는 원본 해시 기준 디스크 스냅샷(snapshot_cache)으로 재사용
+"""
+
+import io
+
+import pandas as pd
+
+import metrics
+import snapshot_cache
+
+SCHEMA_VERSION = 2  # preprocess 결과 구조가 바뀌면 올려서 예전 스냅샷을 무효화
+ENCODINGS = ("cp949", "utf-8", "euc-kr")
+
+
+def read_csv(file_like):
+    """CSV를 cp949 → utf-8 → euc-kr 순으로 시도하여 읽음. 모두 실패하면 마지막 예외"""
+    last_exc = None
+    for enc in ENCODINGS:
+        try:
+            return pd.read_csv(file_like, encoding=enc)
+        except Exception as e:
+            last_exc = e
+            metrics.increment("subway", "encoding_retry", enc)
+            if hasattr(file_like, "seek"):
+                file_like.seek(0)
+    raise last_exc
+
+
+def preprocess(df):
+    df = df.rename(columns=lambda c: c.strip())
+
+    df["사용일자_str"] = df["사용일자"].astype(str)
+    df["사용일자_dt"] = pd.to_datetime(df["사용일자_str"], format="%Y%m%d", errors="coerce")
+
+    for col in ["승차총승객수", "하차총승객수"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+
+    df["승하차합"] = df["승차총승객수"] + df["하차총승객수"]
+    # 날짜·호선 단위로 연속되게 정렬 (build_index/select가 이 순서에 의존)
+    return df.sort_values(["사용일자_dt", "노선명"], kind="stable", ignore_index=True)
+
+
+def build_index(df):
+    """(날짜, 노선명) → (시작, 끝) 행 위치. df는 preprocess 결과(정렬된 상태)여야 함"""
+    index = {}
+    for (ts, line), positions in df.groupby(["사용일자_dt", "노선명"], sort=False).indices.items():
+        index[(ts.date(), line)] = (int(positions[0]), int(positions[-1]) + 1)
+    return index
+
+
+def select(df, index, date, line):
+    """선택한 날짜·호선의 행들. 복사 없이 연속 구간 슬라이스로 반환"""
+    start, stop = index.get((date, line), (0, 0))
+    return df.iloc[start:stop]
+
+
+def top_stations(df, n=10):
+    """역별 승하차합 합계 상위 n개 (역명, 승하차합)"""
+    return (
+        df.groupby("역명", as_index=False)["승하차합"]
+        .sum()
+        .sort_values("승하차합", ascending=False)
+        .head(n)
+    )
+
+
+def load_subway_bytes(data, digest=None):
+    """원본 CSV 바이트 → 정제된 DataFrame. 반환: (DataFrame, 스냅샷 사용 여부)"""
+    return snapshot_cache.load_or_build(
+        "subway", digest or snapshot_cache.bytes_digest(data), SCHEMA_VERSION,
+        lambda: preprocess(read_csv(io.BytesIO(data))),
+    )
+
+
+def load_subway_file(path, digest=None):
+    """로컬 CSV 경로 → 정제된 DataFrame. 반환: (DataFrame, 스냅샷 사용 여부)"""
+    return snapshot_cache.load_or_build(
+        "subway", digest or snapshot_cache.file_digest(path), SCHEMA_VERSION,
+        lambda: preprocess(read_csv(path)),
+    )
@@ -0,0 +1,205 @@
+"""
+데이터 파이프라인 벤치마크 (Streamlit 없이 실행)
+- 페이지가 쓰는 계산 단계(CSV 읽기, 숫자 정제, 연령 열 찾기, preprocess, 스냅샷 로드, 상위 10개 groupby 등)를
+  합성 데이터(tools/synth_data.py)로 하나씩 돌려 단계별 시간과 메모리를 잽니다.
+- 메모리는 기본적으로 tracemalloc 최대 할당(파이썬 힙)입니다. Arrow 할당자는 tracemalloc에 안 잡혀서
+  스냅샷 로드 단계는 RSS 증가량으로 재고 표에 *로 표시합니다. (리눅스 /proc 필요, 없으면 "-")
+- 저장된 기준값(tools/bench_baseline.json)과 비교해 느려진 단계를 표시합니다. 기준값은 기계마다 다르니
+  비교는 같은 기계에서 --save-baseline 으로 만든 값과 하세요.
+
+사용법 (저장소 루트에서):
+    python tools/bench.py                         # small 프리셋
+    python tools/bench.py --preset large          # 10,000 지역 × 60개월, 지하철 1,000만 행
+    python tools/bench.py --save-baseline         # 현재 결과를 기준값으로 저장
+    python tools/bench.py --check                 # 기준값 대비 느려진 단계가 있으면 종료 코드 1
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import population_data  # noqa: E402
+import snapshot_cache  # noqa: E402
+import subway_data  # noqa: E402
+from tools import synth_data  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "tools", "bench_baseline.json")
+DATA_DIR = os.path.join(ROOT, ".bench_data")
+PRESETS = {
+    "small": {"regions": 26, "months": 1, "subway_rows": 100_000},
+    "medium": {"regions": 1_000, "months": 12, "subway_rows": 1_000_000},
+    "large": {"regions": 10_000, "months": 60, "subway_rows": 10_000_000},
+}
+NOISE_FLOOR_SECONDS = 0.005  # 이보다 작은 차이는 느려졌다고 보지 않음
+
+
+def ensure_data(preset):
+    """프리셋 합성 데이터가 없으면 만들고 (인구 경로, 지하철 경로) 반환"""
+    spec = PRESETS[preset]
+    folder = os.path.join(DATA_DIR, preset)
+    population_path = os.path.join(folder, "population.csv")
+    subway_path = os.path.join(folder, "subway.csv")
+    if not os.path.exists(population_path):
+        synth_data.write_population_csv(population_path, spec["regions"], spec["months"])
+    if not os.path.exists(subway_path):
+        synth_data.write_subway_csv(subway_path, spec["subway_rows"])
+    return population_path, subway_path
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return None
+
+
+def measure(fn, *args, memory="heap"):
+    """fn(*args) 한 번 실행. 반환: (결과, 초, MB)
+
+    memory: "heap"이면 tracemalloc 최대 할당, "rss"면 실행 전후 RSS 증가량(결과를 들고 있는 상태), None이면 안 잼
+    """
+    if memory == "heap":
+        tracemalloc.start()
+    rss_before = _rss_mb() if memory == "rss" else None
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+        seconds = time.perf_counter() - start
+        if memory == "heap":
+            mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        elif memory == "rss" and rss_before is not None:
+            mb = max(0.0, _rss_mb() - rss_before)
+        else:
+            mb = None
+    finally:
+        if memory == "heap":
+            tracemalloc.stop()
+    return result, seconds, mb
+
+
+def run_stages(population_path, subway_path, memory=True):
+    """단계 이름 -> {"seconds", "peak_mb", "rows"}
+
+    시간은 tracemalloc 없이 재고, 메모리는 tracemalloc을 켜고 한 번 더 돌려 잽니다.
+    (tracemalloc은 파이썬 객체가 많은 단계를 몇 배씩 느리게 만듦)
+    """
+    results = {}
+
+    def stage(name, fn, *args, fresh=None, rows=None, memory_kind="heap"):
+        # fresh: 입력을 바꾸거나 소비하는 단계용. 실행할 때마다 새 입력 args를 만들어 주는 함수 (만드는 시간은 측정 밖)
+        result, seconds, _ = measure(fn, *(fresh() if fresh else args), memory=None)
+        peak_mb = measure(fn, *(fresh() if fresh else args), memory=memory_kind)[2] if memory else None
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "peak_mb": None if peak_mb is None else round(peak_mb, 2),
+            "memory": memory_kind,
+            "rows": rows if rows is not None else (len(result) if hasattr(result, "__len__") else None),
+        }
+        return result
+
+    # 인구
+    with open(population_path, "rb") as f:
+        data = f.read()
+    # BytesIO는 읽고 나면 끝에 가 있으므로 측정마다 새로 만듦
+    raw = stage("population.read", population_data.try_read_csv, fresh=lambda: (io.BytesIO(data),))
+    age_cols = stage("population.extract_age_cols", population_data.extract_age_cols, raw.columns)
+    stage("population.clean_numeric_column", population_data.clean_numeric_column,
+          fresh=lambda: (raw[age_cols[0][1]].copy(),))
+    clean = stage("population.preprocess", population_data.preprocess, fresh=lambda: (raw.copy(),))
+    indexed = clean.set_index("행정구역명", drop=False)
+    stage("population.age_distribution", population_data.age_distribution, indexed, indexed.index[0],
+          population_data.extract_age_cols(clean.columns))
+
+    # 지하철
+    raw = stage("subway.read", subway_data.read_csv, subway_path)
+    frame = stage("subway.preprocess", subway_data.preprocess, raw)
+    index = stage("subway.build_index", subway_data.build_index, frame)
+    key = sorted(index)[len(index) // 2]
+    stage("subway.top10", lambda: subway_data.top_stations(subway_data.select(frame, index, *key), 10))
+
+    # 스냅샷: 한 번 써 두고 다시 읽는 시간 (서버 재시작 후 콜드 스타트)
+    with tempfile.TemporaryDirectory() as tmp:
+        old_dir, snapshot_cache.SNAPSHOT_DIR = snapshot_cache.SNAPSHOT_DIR, tmp
+        try:
+            for name, load, path in (("population", population_data.load_population_file, population_path),
+                                     ("subway", subway_data.load_subway_file, subway_path)):
+                digest = snapshot_cache.file_digest(path)
+                load(path, digest)
+                stage(f"{name}.snapshot_load", lambda load=load, path=path, digest=digest: load(path, digest)[0],
+                      memory_kind="rss")
+        finally:
+            snapshot_cache.SNAPSHOT_DIR = old_dir
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """단계별 (이름, 현재, 기준, 비율, 느려짐 여부)"""
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        ratio = current["seconds"] / base["seconds"] if base and base["seconds"] else None
+        slower = bool(base) and current["seconds"] > base["seconds"] * (1 + tolerance) \
+            and current["seconds"] - base["seconds"] > NOISE_FLOOR_SECONDS
+        rows.append((name, current, base, ratio, slower))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 없이 시간만 측정")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="기준값 대비 허용 비율 (기본 20%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="느려진 단계가 있으면 종료 코드 1")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    population_path, subway_path = ensure_data(args.preset)
+    results = run_stages(population_path, subway_path, memory=not args.no_memory)
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baselines = json.load(f)
+    rows = compare(results, baselines.get(args.preset, {}), args.tolerance)
+
+    if args.json:
+        print(json.dumps({"preset": args.preset, "stages": results}, ensure_ascii=False, indent=2))
+    else:
+        print(f"프리셋: {args.preset}  (인구 {PRESETS[args.preset]['regions']:,}지역 × {PRESETS[args.preset]['months']}개월, "
+              f"지하철 {PRESETS[args.preset]['subway_rows']:,}행)")
+        print(f"{'단계':<36}{'시간(s)':>10}{'최대MB':>10}{'행':>12}{'기준(s)':>10}{'비율':>8}")
+        for name, current, base, ratio, slower in rows:
+            peak = "-" if current["peak_mb"] is None else f"{current['peak_mb']:.1f}"
+            if current.get("memory") == "rss":
+                peak += "*"
+            n_rows = "-" if current["rows"] is None else f"{current['rows']:,}"
+            base_s = f"{base['seconds']:.4f}" if base else "-"
+            ratio_s = f"{ratio:.2f}x" if ratio else "-"
+            print(f"{name:<36}{current['seconds']:>10.4f}{peak:>10}{n_rows:>12}{base_s:>10}{ratio_s:>8}"
+                  + ("  ← 느려짐" if slower else ""))
+
+    if not args.json and any(r.get("memory") == "rss" for r in results.values()):
+        print("* 파이썬 힙이 아니라 RSS 증가량 (Arrow 할당/메모리 맵 포함)")
+
+    if args.save_baseline:
+        baselines[args.preset] = results
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준값 저장: {BASELINE_PATH}")
+    if args.check and any(slower for *_, slower in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+동시 세션 부하 테스트 (오프라인, Streamlit 앱 테스트 API 사용)
+- 페이지마다 새 파이썬 프로세스를 띄우고, 그 안에서 세션 N개(스레드마다 AppTest 하나)가
+  정해진 위젯 조작(지역 바꾸기/옵션 토글, 날짜·호선 바꾸기, 지도 줌 바꾸기)을 반복합니다.
+- AppTest는 프로세스 전역 Runtime 하나를 쓰므로 스레드끼리 동시에 run()하면 안전하지 않습니다.
+  그래서 run()은 잠금으로 한 번에 하나씩 돌리고, 잠금을 기다린 시간(대기)과 실제 실행 시간을 따로 잽니다.
+  세션 수를 늘리면 실행 지연은 거의 그대로이고 대기가 늘어납니다. (공유 캐시 덕에 실행이 짧아지는지 보는 용도)
+- 조작 한 번 = 재실행 한 번. 실행 지연 p50/p95/p99, 대기 p50/p95, 초당 재실행 수(처리량), 프로세스 최대 RSS를 보고합니다.
+- 데이터: 기본은 합성 데이터(tools/bench.py 프리셋, .bench_data/에 한 번 만들어 둠).
+  --data bundled 이면 앱 기본 경로(/mnt/data/population.csv, subway.csv)를 그대로 씁니다.
+- 서버 없이 한 프로세스 안에서 스크립트를 돌리므로 브라우저 전송/웹소켓 비용은 빠집니다.
+  세션 수를 늘려 가며 지연이 꺾이는 지점을 비교하는 용도로 보세요.
+
+사용법 (저장소 루트에서):
+    python tools/loadtest.py                                  # 세 페이지 × 세션 1, 4, 16
+    python tools/loadtest.py --pages subway --sessions 1 8 32 --steps 30
+    python tools/loadtest.py --preset medium --json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = {
+    "population": "04_인구통계.py",
+    "subway": "pages/05_지하철승하차.py",
+    "poi": "pages/02_관광지.py",
+}
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ---- 세션별 시나리오: at(AppTest)에서 위젯 하나를 바꿈 (run은 호출한 쪽에서) ----
+
+def _by_label(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"위젯 없음: {label!r} (화면에 있는 것: {[w.label for w in widgets]})")
+
+
+def population_step(at, rng):
+    """지역 바꾸기 위주, 가끔 표시 옵션 토글"""
+    if rng.random() < 0.7:
+        region = _by_label(at.selectbox, "지역구 선택")
+        region.select(rng.choice(region.options))
+    else:
+        option = _by_label(at.checkbox, rng.choice(["이동평균(3점) 적용", "세로축 로그 스케일", "데이터 포인트 표시"]))
+        option.set_value(not option.value)
+
+
+def subway_step(at, rng):
+    """날짜 또는 호선 바꾸기"""
+    box = _by_label(at.selectbox, rng.choice(["날짜 선택", "호선 선택"]))
+    box.select(rng.choice(box.options))
+
+
+def poi_step(at, rng):
+    """지도 시작 줌 바꾸기 (가끔 마커 토글)"""
+    if rng.random() < 0.8:
+        _by_label(at.sidebar.slider, "Start zoom").set_value(rng.randint(11, 15))
+    else:
+        markers = _by_label(at.sidebar.checkbox, "Show markers (default: on)")
+        markers.set_value(not markers.value)
+
+
+STEPS = {"population": population_step, "subway": subway_step, "poi": poi_step}
+
+
+# ---- 워커 프로세스: 한 페이지 × 세션 N개 ----
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return None
+
+
+def _check(at):
+    """실행 결과 확인: 예외가 났거나 화면이 비었으면 알아볼 수 있는 오류로"""
+    if at.exception:
+        raise RuntimeError(f"페이지 예외: {at.exception[0].value}")
+    if not at.main.children and not at.sidebar.children:
+        raise RuntimeError("실행 후 화면이 비어 있음 (스크립트가 중간에 멈췄거나 시간 초과)")
+
+
+def run_sessions(page, sessions, steps, seed=0):
+    """세션 N개를 동시에 돌려 결과 dict 반환 (워커 프로세스 안에서 호출)"""
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    script = os.path.join(ROOT, PAGES[page])
+    step = STEPS[page]
+    first_runs, reruns, waits, errors = [], [], [], []
+    lock = threading.Lock()
+    run_lock = threading.Lock()  # AppTest.run()은 한 번에 하나만 (전역 Runtime)
+    barrier = threading.Barrier(sessions)
+    phase_start = []  # 모든 세션의 첫 실행이 끝나고 재실행 구간이 시작된 시각
+
+    def timed_run(at):
+        """반환: (잠금 대기 초, 실행 초)"""
+        queued = time.perf_counter()
+        with run_lock:
+            start = time.perf_counter()
+            at.run()
+            done = time.perf_counter()
+        _check(at)
+        return start - queued, done - start
+
+    def session(number):
+        rng = random.Random(seed * 1000 + number)
+        try:
+            at = AppTest.from_file(script, default_timeout=120)
+            barrier.wait()  # 첫 실행도 같이 줄을 서게 시작 (콜드 스타트 포함)
+            _, seconds = timed_run(at)
+            with lock:
+                first_runs.append(seconds)
+            if barrier.wait() == 0:  # 처리량은 재실행 구간만으로 계산
+                phase_start.append(time.perf_counter())
+            for _ in range(steps):
+                step(at, rng)
+                waited, seconds = timed_run(at)
+                with lock:
+                    reruns.append(seconds)
+                    waits.append(waited)
+        except Exception as e:  # 한 세션이 실패해도 나머지는 계속
+            with lock:
+                errors.append(f"session {number}: {e}")
+            barrier.abort()
+
+    threads = [threading.Thread(target=session, args=(i,), name=f"session-{i}") for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - phase_start[0] if phase_start else 0
+
+    values = sorted(reruns)
+    result = {
+        "page": page,
+        "sessions": sessions,
+        "reruns": len(values),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(values) / wall, 2) if wall else None,
+        "first_run_p50_ms": round(_quantile(sorted(first_runs), 0.5) * 1000, 1) if first_runs else None,
+        "rss_mb": round(_current_rss_mb() or 0, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "errors": errors[:5],
+    }
+    for q in QUANTILES:
+        result[f"p{int(q * 100)}_ms"] = round(_quantile(values, q) * 1000, 1) if values else None
+    waited = sorted(waits)
+    for q in QUANTILES[:2]:
+        result[f"wait_p{int(q * 100)}_ms"] = round(_quantile(waited, q) * 1000, 1) if waited else None
+    return result
+
+
+def measure(page, sessions, steps, seed, env):
+    """새 프로세스에서 run_sessions 실행 (페이지/세션 수마다 메모리를 따로 재기 위해)"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", page,
+           "--sessions", str(sessions), "--steps", str(steps), "--seed", str(seed)]
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "worker failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=list(PAGES))
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 4, 16], help="세션 수 (여러 개면 차례로)")
+    parser.add_argument("--steps", type=int, default=20, help="세션당 위젯 조작(재실행) 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", choices=["synthetic", "bundled"], default="synthetic")
+    parser.add_argument("--preset", default="small", help="합성 데이터 프리셋 (tools/bench.py)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄씩 출력")
+    parser.add_argument("--worker", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_sessions(args.worker, args.sessions[0], args.steps, args.seed), ensure_ascii=False))
+        return
+
+    env = dict(os.environ)
+    if args.data == "synthetic":
+        sys.path.insert(0, ROOT)
+        from tools import bench
+        population_path, subway_path = bench.ensure_data(args.preset)
+        env["APP_POPULATION_PATH"], env["APP_SUBWAY_PATH"] = population_path, subway_path
+
+    if not args.json:
+        print(f"{'페이지':<12}{'세션':>6}{'재실행':>8}{'처리량/s':>10}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}"
+              f"{'대기p50':>9}{'대기p95':>9}{'첫실행ms':>10}{'최대RSS MB':>12}")
+    for page in args.pages:
+        for sessions in args.sessions:
+            result = measure(page, sessions, args.steps, args.seed, env)
+            if args.json:
+                print(json.dumps(result, ensure_ascii=False))
+                continue
+            shown = {k: "-" if v is None else v for k, v in result.items()}  # 모든 세션이 실패하면 None
+            print(f"{page:<12}{sessions:>6}{shown['reruns']:>8}{shown['throughput_rps']:>10}"
+                  f"{shown['p50_ms']:>9}{shown['p95_ms']:>9}{shown['p99_ms']:>9}"
+                  f"{shown['wait_p50_ms']:>9}{shown['wait_p95_ms']:>9}{shown['first_run_p50_ms']:>10}{shown['max_rss_mb']:>12}")
+            for error in result["errors"]:
+                print(f"    ! {error}")
+
+
+if __name__ == "__main__":
+    main()
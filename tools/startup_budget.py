@@ -0,0 +1,84 @@
+"""
+페이지별 시작 시간/메모리 예산 측정
+- 페이지마다 새 파이썬 프로세스에서 Streamlit 앱 테스트 API(AppTest)로 첫 실행만 돌려
+  첫 실행 시간, 최대 RSS, 첫 실행에서 import된 무거운 모듈을 잽니다. (Streamlit 자체 import 시간은 제외)
+- 예산(PAGE_BUDGETS)을 넘거나 첫 실행에서 불러오면 안 되는 모듈이 import되면 종료 코드 1
+- 미리 로드(warmup)는 꺼서(APP_WARMUP=0) 백그라운드 스레드의 import가 페이지 자신의 비용에 섞이지 않게 합니다.
+
+사용법 (저장소 루트에서):
+    python tools/startup_budget.py            # 전체 페이지
+    python tools/startup_budget.py --json     # JSON 한 줄씩 출력
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["numpy", "pandas", "pyarrow", "plotly.express", "plotly.graph_objects", "folium", "streamlit_folium",
+                 "shared_data"]
+
+# 페이지: (첫 실행 예산 ms, 첫 실행에서 import되면 안 되는 모듈)
+PAGE_BUDGETS = {
+    "pages/00_MBTI.py": (600, ["numpy", "pandas"]),
+    "pages/01_책영화추천.py": (600, ["numpy", "pandas"]),
+    # folium.utilities가 설치된 pandas를 스스로 import하므로 pandas 대신 우리 데이터 스택(shared_data)을 막음
+    "pages/02_관광지.py": (2000, ["shared_data"]),
+    "pages/05_지하철승하차.py": (1500, ["plotly.graph_objects"]),  # subway.csv가 없으면 업로드 안내에서 멈춤
+    "04_인구통계.py": (2500, []),
+}
+
+PROBE = r"""
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=60).run()
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "elapsed_ms": round(elapsed_ms, 1),
+    "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "imported": [m for m in {heavy!r} if m in sys.modules and m not in before],
+    "exception": [str(e.value) for e in at.exception],
+}}))
+"""
+
+
+def measure(page):
+    code = PROBE.format(root=ROOT, page=os.path.join(ROOT, page), heavy=HEAVY_MODULES)
+    env = dict(os.environ, APP_WARMUP="0")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="측정할 페이지 (기본: 전체)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄씩 출력")
+    args = parser.parse_args()
+
+    failed = False
+    for page in args.pages or PAGE_BUDGETS:
+        budget_ms, forbidden = PAGE_BUDGETS.get(page, (None, []))
+        result = measure(page)
+        problems = []
+        if budget_ms is not None and result["elapsed_ms"] > budget_ms:
+            problems.append(f"예산 초과 ({budget_ms}ms)")
+        problems += [f"{m} 조기 import" for m in forbidden if m in result["imported"]]
+        problems += [f"예외: {e}" for e in result["exception"]]
+        failed = failed or bool(problems)
+        if args.json:
+            print(json.dumps({"page": page, "budget_ms": budget_ms, **result, "problems": problems}, ensure_ascii=False))
+        else:
+            status = "FAIL" if problems else "ok"
+            print(f"[{status}] {page}: {result['elapsed_ms']}ms / 예산 {budget_ms}ms, "
+                  f"RSS {result['max_rss_mb']}MB, import: {', '.join(result['imported']) or '-'}"
+                  + (f"  ← {'; '.join(problems)}" if problems else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
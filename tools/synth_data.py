@@ -0,0 +1,101 @@
+"""
+벤치마크/부하 테스트용 합성 데이터 생성기 (실제 CSV와 같은 모양)
+- 인구: '행정구역' + 월마다 '{YYYY}년{MM}월_거주자_총인구수', '..._연령구간인구수', '..._0세' ~ '..._99세', '..._100세 이상'
+  숫자는 실제 파일처럼 쉼표가 들어간 문자열, 최대 10,000개 지역 × 101개 나이 × 60개월
+- 지하철: 사용일자, 노선명, 역명, 승차총승객수, 하차총승객수, 등록일자 (cp949), 최대 1,000만 행
+- 큰 파일도 메모리에 한 번에 만들지 않고 청크 단위로 이어 씁니다.
+
+사용법 (저장소 루트에서):
+    python tools/synth_data.py population out/population.csv --regions 10000 --months 60
+    python tools/synth_data.py subway out/subway.csv --rows 10000000
+"""
+
+import argparse
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+LINES = ["1호선", "2호선", "3호선", "4호선", "5호선", "6호선", "7호선", "8호선", "9호선", "경의선", "분당선", "공항철도 1호선"]
+SUBWAY_CHUNK_ROWS = 500_000
+
+
+def population_columns(months, start=(2025, 10)):
+    """최근 달부터 거꾸로 months개월치 열 이름 (실제 파일처럼 월마다 103개 열)"""
+    year, month = start
+    cols = ["행정구역"]
+    for _ in range(months):
+        prefix = f"{year}년{month:02d}월_거주자_"
+        cols += [prefix + "총인구수", prefix + "연령구간인구수"]
+        cols += [f"{prefix}{age}세" for age in range(100)] + [prefix + "100세 이상"]
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return cols
+
+
+def write_population_csv(path, regions=26, months=1, encoding="cp949", seed=0):
+    """합성 인구 CSV 작성. 반환: 쓴 행 수"""
+    rng = np.random.default_rng(seed)
+    ages = np.arange(101)
+    # 나이가 많을수록 줄어드는 기본 분포 + 지역별 규모/잡음
+    base_shape = np.exp(-ages / 45.0)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(population_columns(months))
+        for i in range(regions):
+            scale = rng.uniform(200, 8000)
+            row = [f"서울특별시 합성구{i:05d} ({1100000000 + i * 100:010d})"]
+            for _ in range(months):
+                by_age = (base_shape * scale * rng.uniform(0.9, 1.1, size=len(ages))).astype(int)
+                total = f"{int(by_age.sum()):,}"
+                row += [total, total] + [f"{v:,}" for v in by_age]
+            writer.writerow(row)
+    return regions
+
+
+def write_subway_csv(path, rows=100_000, days=31, stations_per_line=40, encoding="cp949", seed=0):
+    """합성 지하철 승하차 CSV 작성 (2025년 10월 날짜). 반환: 쓴 행 수"""
+    rng = np.random.default_rng(seed)
+    dates = np.array([20251001 + d for d in range(days)])
+    stations = np.array([f"역{i:03d}" for i in range(stations_per_line)])
+    lines = np.array(LINES)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    written = 0
+    first = True
+    while written < rows:
+        n = min(SUBWAY_CHUNK_ROWS, rows - written)
+        chunk = pd.DataFrame({
+            "사용일자": rng.choice(dates, n),
+            "노선명": rng.choice(lines, n),
+            "역명": rng.choice(stations, n),
+            "승차총승객수": rng.integers(0, 60_000, n),
+            "하차총승객수": rng.integers(0, 60_000, n),
+            "등록일자": 20251103,
+        })
+        chunk.to_csv(path, mode="w" if first else "a", header=first, index=False, encoding=encoding)
+        written += n
+        first = False
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["population", "subway"])
+    parser.add_argument("path")
+    parser.add_argument("--regions", type=int, default=26)
+    parser.add_argument("--months", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.kind == "population":
+        n = write_population_csv(args.path, args.regions, args.months, seed=args.seed)
+    else:
+        n = write_subway_csv(args.path, args.rows, seed=args.seed)
+    print(f"{args.path}: {n:,}행")
+
+
+if __name__ == "__main__":
+    main()
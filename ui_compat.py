@@ -0,0 +1,31 @@
+"""
+Streamlit 버전 차이를 흡수하는 작은 도우미
+"""
+
+
+def fragment(func):
+    """부분 재실행 데코레이터: st.fragment (1.37+) → st.experimental_fragment (1.33~1.36) → 없으면 그냥 함수
+
+    fragment 안의 위젯을 바꾸면 그 함수만 다시 실행됩니다. 오래된 Streamlit에서는 예전처럼 전체 재실행.
+    fragment 안에서는 사이드바에 쓸 수 없으니 위젯은 본문에 둡니다.
+    """
+    import streamlit as st
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(func) if decorator else func
+
+
+def download_button(label, make_data, key, **kwargs):
+    """누를 때 make_data()로 파일을 만드는 다운로드 버튼 (큰 파일을 재실행마다 만들지 않음)
+
+    data에 함수를 못 받는 예전 Streamlit이면 '준비' 버튼을 눌렀을 때만 만들어서 다운로드 버튼을 보여줍니다.
+    (거부하는 방식이 버전마다 다름: 1.24~1.45는 RuntimeError("Invalid binary data format"), 그 뒤는 StreamlitAPIException)
+    """
+    import streamlit as st
+    from streamlit.errors import StreamlitAPIException
+    try:
+        return st.download_button(label, make_data, key=key, **kwargs)
+    except (StreamlitAPIException, RuntimeError):
+        pass
+    if st.button(f"{label} 준비", key=f"{key}_prepare"):
+        return st.download_button(label, make_data(), key=f"{key}_ready", **kwargs)
+    return False
@@ -0,0 +1,104 @@
+"""
+데이터셋 미리 로드 (warm-up)
+- 서버에서 첫 세션이 열리면 인구/지하철 데이터를 스레드 풀에서 동시에 읽고 정제·인덱싱해
+  shared_data의 공유 캐시에 넣어 둡니다. 이후 페이지는 준비된 데이터를 바로 씁니다.
+- 스레드를 쓰는 이유: 결과가 이 프로세스의 공유 캐시에 들어가야 하고, pandas CSV 파서/Arrow 읽기는
+  대부분 GIL을 풀고 돌아서 스레드끼리도 겹쳐서 실행됩니다. (프로세스 풀은 결과를 다시 복사해 와야 함)
+- 페이지에서 같은 데이터를 요청하면 shared_data가 진행 중인 로드를 기다리므로 두 번 읽지 않습니다.
+- 이 모듈은 표준 라이브러리만 import 합니다. shared_data(pandas)는 백그라운드 스레드에서 불러오므로
+  데이터가 필요 없는 페이지(관광지 지도)도 첫 화면을 늦추지 않고 warm-up을 시작할 수 있습니다.
+- QUERY_API_PORT가 있으면 조회 API(query_api)도 따로 데몬 스레드에서 띄웁니다. (데이터 로드를 기다리지 않고
+  바로 포트를 열어 /health가 응답함. 데이터가 필요한 요청은 shared_data가 진행 중인 로드를 기다림)
+- APP_WARMUP=0 이면 아무것도 하지 않음 (페이지 자신의 첫 실행 비용만 잴 때, tools/startup_budget.py)
+
+배포 전에 스냅샷을 미리 만들어 두려면 (저장소 루트에서):
+    python warmup.py
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 이름 -> (shared_data의 경로 상수, 로더 함수 이름)
+TASKS = {
+    "인구": ("POPULATION_PATH", "population_from_file"),
+    "지하철": ("SUBWAY_PATH", "subway_from_file"),
+}
+ENABLED = os.environ.get("APP_WARMUP", "1") != "0"
+
+_lock = threading.Lock()
+_executor = None
+_futures = {}   # 이름 -> Future (원본 파일이 없으면 결과가 None)
+_started = {}   # 이름 -> 시작 시각
+_elapsed = {}   # 이름 -> 걸린 시간(초)
+
+
+def _run(name, path_attr, loader):
+    import shared_data
+    _started[name] = time.perf_counter()
+    try:
+        path = getattr(shared_data, path_attr)
+        if not os.path.exists(path):
+            return None
+        return getattr(shared_data, loader)(path)
+    finally:
+        _elapsed[name] = time.perf_counter() - _started[name]
+
+
+def _start_query_api():
+    import query_api
+    query_api.start_from_env()
+
+
+def start(max_workers=len(TASKS), api=True):
+    """프로세스당 한 번만 실제로 시작 (여러 번 불러도 안전). 호출한 스레드에서는 무거운 import를 하지 않음
+
+    api=False면 데이터만 미리 읽고 조회 API는 띄우지 않음 (query_api를 단독 실행할 때)
+    """
+    global _executor
+    if not ENABLED:
+        return
+    with _lock:
+        if _executor is not None:
+            return
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup")
+        for name, (path_attr, loader) in TASKS.items():
+            _futures[name] = _executor.submit(_run, name, path_attr, loader)
+        if api and os.environ.get("QUERY_API_PORT"):
+            threading.Thread(target=_start_query_api, name="warmup-query-api", daemon=True).start()
+        _executor.shutdown(wait=False)
+
+
+def status():
+    """이름 -> "준비됨" / "준비 중" / "실패: ..." (시작하지 않았거나 원본이 없는 데이터셋은 빠짐)"""
+    result = {}
+    for name, future in list(_futures.items()):
+        if not future.done():
+            result[name] = "준비 중"
+        elif future.exception() is not None:
+            result[name] = f"실패: {future.exception()}"
+        elif future.result() is not None:
+            result[name] = "준비됨"
+    return result
+
+
+def render_status(container):
+    """아직 준비 중인 데이터셋이 있으면 container(예: st.sidebar)에 한 줄로 표시"""
+    warming = [name for name, state in status().items() if state == "준비 중"]
+    if warming:
+        container.caption(f"⏳ 데이터 미리 불러오는 중: {', '.join(warming)}")
+
+
+if __name__ == "__main__":
+    start()
+    for name, future in list(_futures.items()):
+        try:
+            dataset = future.result()
+            if dataset is None:
+                print(f"{name}: 원본 파일 없음 — 건너뜀")
+                continue
+            source = "스냅샷" if dataset.from_snapshot else "CSV 파싱"
+            print(f"{name}: {_elapsed[name]:.2f}s ({source})")
+        except Exception as e:
+            print(f"{name}: 실패 — {e}")